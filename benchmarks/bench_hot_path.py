@@ -0,0 +1,258 @@
+"""Microbenchmarks for the advertisement and entity update hot path.
+
+Drives ACInfinityDevice.set_ble_device_and_advertisement_data,
+ACInfinityDataUpdateCoordinator._async_handle_bluetooth_event and each
+entity's _update_attrs with synthetic manufacturer data for every model in
+DEVICE_MODEL, and reports calls per second and bytes allocated per call.
+
+Run from the repository root in an environment with Home Assistant and the
+integration's requirements installed:
+
+    python benchmarks/bench_hot_path.py
+    python benchmarks/bench_hot_path.py --compare benchmarks/baseline.json
+    python benchmarks/bench_hot_path.py --save benchmarks/baseline.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ac_infinity_ble.const import MANUFACTURER_ID  # noqa: E402
+from bleak.backends.device import BLEDevice  # noqa: E402
+from bleak.backends.scanner import AdvertisementData  # noqa: E402
+from homeassistant.components.bluetooth import (  # noqa: E402
+    BluetoothChange,
+    BluetoothServiceInfoBleak,
+)
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.ac_infinity.const import DEVICE_MODEL  # noqa: E402
+from custom_components.ac_infinity.coordinator import \
+    ACInfinityDataUpdateCoordinator  # noqa: E402
+from custom_components.ac_infinity.device import (  # noqa: E402
+    ACInfinityDevice, AutoModeConfig)
+from custom_components.ac_infinity.fan import ACInfinityFan  # noqa: E402
+from custom_components.ac_infinity.number import (  # noqa: E402
+    PercentageNumber, TemperatureNumber)
+from custom_components.ac_infinity.sensor import (  # noqa: E402
+    HumiditySensor, TemperatureSensor, VpdSensor)
+from custom_components.ac_infinity.switch import ACInfinitySwitch  # noqa: E402
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+# Relative slowdown, against the baseline, reported as a regression.
+REGRESSION_THRESHOLD = 0.2
+
+
+def manufacturer_data(device_type: int, tmp: int = 2345, hum: int = 5678, fan: int = 5) -> bytes:
+    """Synthetic manufacturer data in the layout parsed by parse_manufacturer_data."""
+    data = bytearray(23)
+    data[6:11] = b"ABCDE"
+    data[11] = 3  # firmware version
+    data[12] = device_type
+    data[13] = 0b00000010
+    data[14:16] = tmp.to_bytes(2, "big", signed=True)
+    data[16:18] = hum.to_bytes(2, "big", signed=True)
+    data[18] = fan
+    data[19] = 1
+    data[21:23] = (123).to_bytes(2, "big", signed=True)
+    return bytes(data)
+
+
+def service_info(ble_device: BLEDevice, data: bytes) -> BluetoothServiceInfoBleak:
+    advertisement = AdvertisementData(
+        local_name=None,
+        manufacturer_data={MANUFACTURER_ID: data},
+        service_data={},
+        service_uuids=[],
+        tx_power=None,
+        rssi=-60,
+        platform_data=(),
+    )
+    return BluetoothServiceInfoBleak(
+        name=ADDRESS,
+        address=ADDRESS,
+        rssi=-60,
+        manufacturer_data=advertisement.manufacturer_data,
+        service_data={},
+        service_uuids=[],
+        source="local",
+        device=ble_device,
+        advertisement=advertisement,
+        connectable=True,
+        time=time.monotonic(),
+        tx_power=None,
+    )
+
+
+def measure(func: Callable[[int], Any], iterations: int) -> dict[str, float]:
+    """Return calls per second and mean peak bytes allocated per call of func(i)."""
+    for i in range(min(iterations, 1000)):
+        func(i)
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        func(i)
+    elapsed = time.perf_counter() - start
+
+    samples = min(iterations, 1000)
+    allocated = 0
+    tracemalloc.start()
+    for i in range(samples):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func(i)
+        _, peak = tracemalloc.get_traced_memory()
+        allocated += peak - before
+    tracemalloc.stop()
+
+    return {
+        "calls_per_second": iterations / elapsed,
+        "us_per_call": elapsed / iterations * 1e6,
+        "bytes_per_call": allocated / samples,
+    }
+
+
+async def run(iterations: int) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+    hass = HomeAssistant(tempfile.mkdtemp())
+    logging.getLogger("custom_components.ac_infinity").setLevel(logging.INFO)
+    logging.getLogger("ac_infinity_ble").setLevel(logging.INFO)
+
+    for device_type, model in DEVICE_MODEL.items():
+        ble_device = BLEDevice(ADDRESS, None, {}, -60)
+        # Eight distinct payloads cycled through, so every call decodes;
+        # "repeated" sends the same payload every time.
+        changing = [manufacturer_data(device_type, tmp=2000 + i) for i in range(8)]
+        changing_infos = [service_info(ble_device, data) for data in changing]
+        repeated_info = service_info(ble_device, changing[0])
+
+        device = ACInfinityDevice(ble_device, advertisement_data=repeated_info.advertisement)
+        device.state.work_type = 2
+        device.state.level_on = 5
+        device.state.level_off = 1
+        device.state.auto_mode = AutoModeConfig(True, 30, True, 15, False, 70, False, 40)
+
+        results[f"{model}: device advertisement (changing)"] = measure(
+            lambda i: device.set_ble_device_and_advertisement_data(
+                ble_device, changing_infos[i & 7].advertisement
+            ),
+            iterations,
+        )
+        results[f"{model}: device advertisement (repeated)"] = measure(
+            lambda i: device.set_ble_device_and_advertisement_data(
+                ble_device, repeated_info.advertisement
+            ),
+            iterations,
+        )
+
+        with patch(
+            "homeassistant.components.bluetooth.update_coordinator.async_address_present",
+            return_value=True,
+        ):
+            coordinator = ACInfinityDataUpdateCoordinator(
+                hass, logging.getLogger(__name__), ble_device, device
+            )
+        results[f"{model}: coordinator bluetooth event"] = measure(
+            lambda i: coordinator._async_handle_bluetooth_event(
+                changing_infos[i & 7], BluetoothChange.ADVERTISEMENT
+            ),
+            iterations,
+        )
+
+        entities = {
+            "fan": ACInfinityFan(coordinator, device, "Fan"),
+            "temperature sensor": TemperatureSensor(coordinator, device, "Temperature"),
+            "humidity sensor": HumiditySensor(coordinator, device, "Humidity"),
+            "vpd sensor": VpdSensor(coordinator, device, "VPD"),
+            "percentage number": PercentageNumber(
+                coordinator, device, "Min Speed", lambda d: d.min_speed,
+                ACInfinityDevice.async_set_min_speed,
+            ),
+            "temperature number": TemperatureNumber(
+                coordinator, device, "Auto Mode High Temperature",
+                lambda d: None if d.auto_mode is None else d.auto_mode.high_temp,
+                ACInfinityDevice.async_set_auto_high_temp,
+            ),
+            "switch": ACInfinitySwitch(
+                coordinator, device, "Auto Mode High Temperature Trigger",
+                lambda d: None if d.auto_mode is None else d.auto_mode.high_temp_enabled,
+                ACInfinityDevice.async_set_auto_mode_high_temp_enabled,
+            ),
+        }
+        for name, entity in entities.items():
+            results[f"{model}: {name} _update_attrs"] = measure(
+                lambda i, entity=entity: entity._update_attrs(), iterations
+            )
+
+        await device.stop()
+
+    await hass.async_stop(force=True)
+    return results
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, Any]) -> bool:
+    """Print slowdowns against the baseline; return whether any exceed the threshold."""
+    regressed = False
+    for name, result in results.items():
+        if (base := baseline["results"].get(name)) is None:
+            continue
+        change = result["us_per_call"] / base["us_per_call"] - 1
+        if change > REGRESSION_THRESHOLD:
+            regressed = True
+            print(f"REGRESSION {name}: {base['us_per_call']:.2f} -> {result['us_per_call']:.2f} us/call ({change:+.0%})")
+    return regressed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--compare", type=Path, help="baseline JSON file to compare against")
+    parser.add_argument("--save", type=Path, help="write results as a new baseline JSON file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.iterations))
+
+    width = max(len(name) for name in results)
+    print(f"{'benchmark':<{width}}  {'calls/s':>12}  {'us/call':>9}  {'bytes/call':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<{width}}  {result['calls_per_second']:>12,.0f}"
+            f"  {result['us_per_call']:>9.2f}  {result['bytes_per_call']:>10.0f}"
+        )
+
+    if args.save:
+        args.save.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "iterations": args.iterations,
+                    "results": {
+                        name: {metric: round(value, 3) for metric, value in result.items()}
+                        for name, result in results.items()
+                    },
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+    if args.compare:
+        return int(compare(results, json.loads(args.compare.read_text())))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
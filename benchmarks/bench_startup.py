@@ -0,0 +1,240 @@
+"""Import and setup time of the integration, checked against a startup budget.
+
+Each module is imported in a fresh interpreter that has already imported what
+Home Assistant itself loads before any custom integration (the core, config
+entries, config validation and the bluetooth integration), so only the cost
+added by this integration is counted. Platform modules are timed after the
+package, including the Home Assistant entity component they pull in. The
+third-party packages each import loads for the first time are listed.
+
+Config entries are then set up in a Home Assistant instance with Bluetooth
+patched out, through the real config entry and entity platform machinery, and
+the wall time of setting up all of them is reported.
+
+Run from the repository root in an environment with Home Assistant and the
+integration's requirements installed:
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --entries 50
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import logging
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+from unittest.mock import patch
+
+REPOSITORY = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.ac_infinity"
+MODULES = [
+    PACKAGE,
+    f"{PACKAGE}.config_flow",
+    f"{PACKAGE}.diagnostics",
+    f"{PACKAGE}.fan",
+    f"{PACKAGE}.number",
+    f"{PACKAGE}.sensor",
+    f"{PACKAGE}.switch",
+]
+# Imported by Home Assistant before any custom integration is loaded.
+PRELOADED = [
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.components.bluetooth",
+]
+
+# Startup budget, in milliseconds. Keep in step with the README.
+BUDGET_IMPORT_MS = {
+    PACKAGE: 30,
+    f"{PACKAGE}.config_flow": 5,
+    f"{PACKAGE}.diagnostics": 5,
+    # Mostly the Home Assistant entity component of the platform, which is
+    # already loaded if any other integration uses the platform.
+    f"{PACKAGE}.fan": 15,
+    f"{PACKAGE}.number": 15,
+    f"{PACKAGE}.sensor": 25,
+    f"{PACKAGE}.switch": 15,
+}
+BUDGET_SETUP_MS_PER_ENTRY = {
+    "first setup": 15,
+    "setup with registered entities": 8,
+}
+
+# Prints the milliseconds taken to import the last module given, after the
+# others, and the top-level packages it loaded for the first time.
+_IMPORT_PROBE = """
+import importlib, json, sys, time
+sys.path.insert(0, sys.argv[1])
+for name in sys.argv[2].split(","):
+    importlib.import_module(name)
+for name in sys.argv[3:-1]:
+    importlib.import_module(name)
+before = {name.partition(".")[0] for name in sys.modules}
+start = time.perf_counter()
+importlib.import_module(sys.argv[-1])
+elapsed = time.perf_counter() - start
+loaded = sorted({name.partition(".")[0] for name in sys.modules} - before)
+print(json.dumps({"ms": elapsed * 1000, "loaded": loaded}))
+"""
+
+
+def measure_import(module: str, repeat: int) -> dict[str, Any]:
+    """Return the median import time of module and the packages it loads."""
+    prerequisites = [] if module == PACKAGE else [PACKAGE]
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _IMPORT_PROBE, str(REPOSITORY), ",".join(PRELOADED), *prerequisites, module],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        samples.append(json.loads(output.splitlines()[-1]))
+    return {
+        "ms": statistics.median(sample["ms"] for sample in samples),
+        "loaded": [name for name in samples[0]["loaded"] if name not in ("custom_components", "homeassistant")],
+    }
+
+
+def manufacturer_data(index: int, device_type: int = 11) -> bytes:
+    """Synthetic manufacturer data in the layout parsed by parse_manufacturer_data."""
+    data = bytearray(23)
+    data[6:11] = f"{index:05d}".encode("ascii")
+    data[11] = 3  # firmware version
+    data[12] = device_type
+    data[13] = 0b00000010
+    data[14:16] = (2345).to_bytes(2, "big", signed=True)
+    data[16:18] = (5678).to_bytes(2, "big", signed=True)
+    data[18] = 5
+    data[21:23] = (123).to_bytes(2, "big", signed=True)
+    return bytes(data)
+
+
+async def measure_setup(entries: int) -> dict[str, float]:
+    """Return the seconds taken to set up `entries` config entries, first and again."""
+    # Imported here, so that the import measurements above run first and
+    # unaffected by them.
+    from bleak.backends.device import BLEDevice
+    from homeassistant import loader
+    from homeassistant.config_entries import ConfigEntries, ConfigEntry
+    from homeassistant.const import CONF_ADDRESS, CONF_SERVICE_DATA
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers import (area_registry, device_registry,
+                                       entity_registry, floor_registry,
+                                       label_registry)
+    from homeassistant.setup import async_setup_component
+
+    config_dir = Path(tempfile.mkdtemp())
+    (config_dir / "custom_components").mkdir()
+    (config_dir / "custom_components" / "ac_infinity").symlink_to(REPOSITORY / PACKAGE.replace(".", "/"))
+    sys.path.insert(0, str(config_dir))
+
+    hass = HomeAssistant(str(config_dir))
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    for registry in (floor_registry, label_registry, area_registry, device_registry, entity_registry):
+        await registry.async_load(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    # Bluetooth is set up by Home Assistant before this integration.
+    hass.config.components.update({"bluetooth", "bluetooth_adapters"})
+    logging.getLogger("homeassistant.loader").setLevel(logging.ERROR)
+
+    from ac_infinity_ble.protocol import parse_manufacturer_data
+
+    def ble_device(hass: HomeAssistant, address: str, connectable: bool = True) -> BLEDevice:
+        return BLEDevice(address, None, {}, -60)
+
+    config_entries = []
+    for index in range(entries):
+        address = f"AA:BB:CC:DD:{index >> 8:02X}:{index & 255:02X}"
+        service_data = dataclasses.asdict(parse_manufacturer_data(manufacturer_data(index)))
+        config_entry = ConfigEntry(
+            data={CONF_ADDRESS: address, CONF_SERVICE_DATA: service_data},
+            discovery_keys=MappingProxyType({}),
+            domain="ac_infinity",
+            minor_version=1,
+            options={},
+            source="bluetooth",
+            subentries_data=None,
+            title=f"Controller {index}",
+            unique_id=address,
+            version=1,
+        )
+        # Added without being set up, as if loaded from storage at startup.
+        hass.config_entries._entries[config_entry.entry_id] = config_entry
+        config_entries.append(config_entry)
+
+    with (
+        patch("homeassistant.components.bluetooth.async_ble_device_from_address", ble_device),
+        patch("homeassistant.components.bluetooth.update_coordinator.async_address_present", return_value=True),
+        patch("homeassistant.components.bluetooth.update_coordinator.async_register_callback"),
+        patch("homeassistant.components.bluetooth.update_coordinator.async_track_unavailable"),
+    ):
+        results = {}
+        start = time.perf_counter()
+        assert await async_setup_component(hass, "ac_infinity", {})
+        await hass.async_block_till_done()
+        results["first setup"] = time.perf_counter() - start
+        await asyncio.gather(
+            *(hass.config_entries.async_unload(config_entry.entry_id) for config_entry in config_entries)
+        )
+
+        # As on a restart: modules imported and entities already registered.
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(hass.config_entries.async_setup(config_entry.entry_id) for config_entry in config_entries)
+        )
+        await hass.async_block_till_done()
+        results["setup with registered entities"] = time.perf_counter() - start
+        await asyncio.gather(
+            *(hass.config_entries.async_unload(config_entry.entry_id) for config_entry in config_entries)
+        )
+
+    await hass.async_stop(force=True)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=20, help="config entries to set up")
+    parser.add_argument("--repeat", type=int, default=5, help="imports of each module to take the median of")
+    args = parser.parse_args()
+
+    over_budget = False
+    width = max(len(module) for module in MODULES)
+    print(f"{'module':<{width}}  {'import ms':>9}  {'budget':>6}  first loads")
+    for module in MODULES:
+        result = measure_import(module, args.repeat)
+        budget = BUDGET_IMPORT_MS[module]
+        flag = "  OVER BUDGET" if result["ms"] > budget else ""
+        over_budget |= bool(flag)
+        print(f"{module:<{width}}  {result['ms']:>9.1f}  {budget:>6}  {', '.join(result['loaded'])}{flag}")
+
+    print()
+    for name, elapsed in asyncio.run(measure_setup(args.entries)).items():
+        per_entry = elapsed / args.entries * 1000
+        budget = BUDGET_SETUP_MS_PER_ENTRY[name]
+        flag = "  OVER BUDGET" if per_entry > budget else ""
+        over_budget |= bool(flag)
+        print(
+            f"{name}: {args.entries} entries in {elapsed * 1000:.0f} ms, "
+            f"{per_entry:.1f} ms per entry (budget {budget}){flag}"
+        )
+    return int(over_budget)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
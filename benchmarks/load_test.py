@@ -0,0 +1,331 @@
+"""Load and latency test of ACInfinityDevice against simulated controllers.
+
+Runs N ACInfinityDevice instances, spread over several simulated Bluetooth
+proxies, against the in-process controller simulator in simulator.py. Each
+device polls and receives user commands for the given duration, and the
+polls and commands are timed end to end. A set of behaviour checks then runs:
+command coalescing, user commands ahead of polls (also while the commands are
+still being coalesced), per-source connection limits, kept connections
+handing their slots to waiting devices and recovery from dropped links.
+
+Run from the repository root in an environment with Home Assistant and the
+integration's requirements installed:
+
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --devices 20 --proxies 3 --drop-probability 0.05
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from simulator import ControllerSimulator, SimulatorProfile  # noqa: E402
+
+from custom_components.ac_infinity.device import (  # noqa: E402
+    WORK_TYPE_AUTO, WORK_TYPE_ON, ACInfinityDevice)
+from custom_components.ac_infinity.scheduler import \
+    ConnectionScheduler  # noqa: E402
+
+
+def address(index: int) -> str:
+    return f"AA:BB:CC:DD:{index >> 8:02X}:{index & 255:02X}"
+
+
+def make_device(
+    simulator: ControllerSimulator,
+    index: int,
+    scheduler: ConnectionScheduler | None,
+    source: str,
+    **kwargs: Any,
+) -> ACInfinityDevice:
+    controller = simulator.add_controller(address(index), device_type=(1, 6, 7, 11)[index % 4])
+    device = ACInfinityDevice(
+        controller.ble_device,
+        advertisement_data=controller.advertisement(),
+        connection_scheduler=scheduler,
+        **kwargs,
+    )
+    device.connection_source = source
+    return device
+
+
+async def timed(samples: dict[str, list[float]], name: str, operation: Awaitable[Any]) -> bool:
+    start = time.monotonic()
+    try:
+        await operation
+    except Exception:  # pylint: disable=broad-except
+        samples.setdefault(f"{name} failed", []).append(time.monotonic() - start)
+        return False
+    samples.setdefault(name, []).append(time.monotonic() - start)
+    return True
+
+
+async def drive(
+    device: ACInfinityDevice,
+    samples: dict[str, list[float]],
+    duration: float,
+    poll_every: float,
+    command_every: float,
+    rng: random.Random,
+) -> None:
+    """Poll the device and send it random user commands until `duration` has passed."""
+    end = time.monotonic() + duration
+    next_poll = time.monotonic() + rng.uniform(0, poll_every)
+    next_command = time.monotonic() + rng.expovariate(1 / command_every)
+    tasks: set[asyncio.Task[bool]] = set()
+    while (now := time.monotonic()) < end:
+        if now >= next_poll:
+            tasks.add(asyncio.create_task(timed(samples, "poll", device.update())))
+            next_poll = now + poll_every
+        if now >= next_command:
+            command = rng.choice(
+                (
+                    lambda: device.set_speed(rng.randint(1, 10)),
+                    lambda: device.async_set_min_speed(rng.randint(0, 3)),
+                    lambda: device.turn_off(),
+                    lambda: device.set_mode_auto(),
+                )
+            )
+            tasks.add(asyncio.create_task(timed(samples, "command", command())))
+            next_command = now + rng.expovariate(1 / command_every)
+        await asyncio.sleep(min(next_poll, next_command, end) - now)
+    await asyncio.gather(*tasks)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def report(samples: dict[str, list[float]], simulator: ControllerSimulator) -> None:
+    print(f"{'operation':<16}  {'count':>6}  {'p50 ms':>8}  {'p95 ms':>8}  {'max ms':>8}")
+    for name, values in sorted(samples.items()):
+        print(
+            f"{name:<16}  {len(values):>6}  {statistics.median(values) * 1000:>8.0f}"
+            f"  {percentile(values, 0.95) * 1000:>8.0f}  {max(values) * 1000:>8.0f}"
+        )
+    stats = simulator.stats
+    print(
+        f"connections {stats.connections}, commands {stats.commands}, drops {stats.drops}, "
+        f"slow responses {stats.slow_responses}, rejected connections {stats.rejected_connections}, "
+        f"max concurrent connections {stats.max_concurrent_connections}"
+    )
+
+
+async def run_load(args: argparse.Namespace) -> None:
+    profile = SimulatorProfile(
+        connect_latency=args.connect_latency,
+        response_latency=args.response_latency,
+        slow_response_probability=args.slow_probability,
+        drop_probability=args.drop_probability,
+        seed=args.seed,
+    )
+    simulator = ControllerSimulator(profile)
+    scheduler = ConnectionScheduler()
+    devices = [
+        make_device(simulator, i, scheduler, f"proxy-{i % args.proxies}", keep_connected=args.keep_connected)
+        for i in range(args.devices)
+    ]
+    samples: dict[str, list[float]] = {}
+    rng = random.Random(args.seed)
+    with simulator.patch():
+        await asyncio.gather(
+            *(
+                drive(device, samples, args.duration, args.poll_every, args.command_every, rng)
+                for device in devices
+            )
+        )
+        for device in devices:
+            await device.stop()
+    report(samples, simulator)
+
+
+async def check_coalescing() -> str | None:
+    simulator = ControllerSimulator(SimulatorProfile(connect_latency=0.05, response_latency=0.01))
+    device = make_device(simulator, 0, None, "local")
+    with simulator.patch():
+        await asyncio.gather(device.set_speed(3), device.set_speed(7), device.async_set_min_speed(2))
+        await device.stop()
+    controller = simulator.controllers[device.address]
+    if simulator.stats.connections != 1 or simulator.stats.commands != 2:
+        return f"expected 1 connection and 2 commands, got {simulator.stats}"
+    if (controller.level_on, controller.level_off) != (7, 2):
+        return f"controller has levels {controller.level_on}/{controller.level_off}, expected 7/2"
+    return None
+
+
+async def check_priority() -> str | None:
+    # Responses outlast the command coalescing window, so the command is
+    # queued while the first poll still holds the connection.
+    simulator = ControllerSimulator(SimulatorProfile(connect_latency=0.05, response_latency=0.5))
+    device = make_device(simulator, 0, None, "local")
+    order: list[str] = []
+
+    async def record(name: str, operation: Awaitable[None]) -> None:
+        await operation
+        order.append(name)
+
+    with simulator.patch():
+        # The first poll occupies the connection; the second poll and the
+        # command queue behind it, and the command must go first.
+        first = asyncio.create_task(record("poll 1", device.update()))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(record("poll 2", device.update()))
+        await asyncio.sleep(0.01)
+        command = asyncio.create_task(record("command", device.set_mode_auto()))
+        await asyncio.gather(first, second, command)
+        await device.stop()
+    if order != ["poll 1", "command", "poll 2"]:
+        return f"operations completed in order {order}"
+    if simulator.controllers[device.address].work_type != WORK_TYPE_AUTO:
+        return "controller did not switch to auto mode"
+    return None
+
+
+async def check_priority_while_coalescing() -> str | None:
+    # The poll is requested while the command still waits out the coalescing
+    # window, before it reaches the operation queue.
+    simulator = ControllerSimulator(SimulatorProfile(connect_latency=0.05, response_latency=0.5))
+    device = make_device(simulator, 0, None, "local")
+    order: list[str] = []
+
+    async def record(name: str, operation: Awaitable[None]) -> None:
+        await operation
+        order.append(name)
+
+    with simulator.patch():
+        command = asyncio.create_task(record("command", device.set_mode_auto()))
+        await asyncio.sleep(0.1)
+        poll = asyncio.create_task(record("poll", device.update()))
+        await asyncio.gather(command, poll)
+        await device.stop()
+    if order != ["command", "poll"]:
+        return f"operations completed in order {order}"
+    return None
+
+
+async def check_scheduler() -> str | None:
+    # The simulated radio refuses more connections than the scheduler allows,
+    # so every operation fails if the scheduler lets too many through.
+    simulator = ControllerSimulator(
+        SimulatorProfile(connect_latency=0.05, response_latency=0.02, connection_slots=2)
+    )
+    scheduler = ConnectionScheduler(slots_per_source=2)
+    devices = [make_device(simulator, i, scheduler, "proxy") for i in range(8)]
+    with simulator.patch():
+        results = await asyncio.gather(*(device.update() for device in devices), return_exceptions=True)
+        for device in devices:
+            await device.stop()
+    if failures := [result for result in results if isinstance(result, BaseException)]:
+        return f"{len(failures)} polls failed, first: {failures[0]!r}"
+    if simulator.stats.max_concurrent_connections != 2:
+        return f"max concurrent connections {simulator.stats.max_concurrent_connections}, expected 2"
+    return None
+
+
+async def check_kept_connections_yield() -> str | None:
+    # The idle timeout outlasts the check, so the last two devices only get
+    # a slot if the idle kept connections hand theirs over.
+    simulator = ControllerSimulator(
+        SimulatorProfile(connect_latency=0.05, response_latency=0.02, connection_slots=2)
+    )
+    scheduler = ConnectionScheduler(slots_per_source=2)
+    devices = [
+        make_device(simulator, i, scheduler, "proxy", keep_connected=True, idle_timeout=600)
+        for i in range(4)
+    ]
+    with simulator.patch():
+        await asyncio.gather(*(device.update() for device in devices[:2]))
+        await devices[0].update()
+        if simulator.stats.connections != 2:
+            return f"{simulator.stats.connections} connections for 3 polls of 2 kept devices, expected 2"
+        await asyncio.wait_for(asyncio.gather(*(device.update() for device in devices[2:])), 5)
+        await asyncio.wait_for(devices[0].set_speed(4), 5)
+        for device in devices:
+            await device.stop()
+    if simulator.stats.max_concurrent_connections != 2:
+        return f"max concurrent connections {simulator.stats.max_concurrent_connections}, expected 2"
+    if simulator.controllers[devices[0].address].work_type != WORK_TYPE_ON:
+        return "command after handing over the slot did not reach the controller"
+    return None
+
+
+async def check_dropped_link() -> str | None:
+    simulator = ControllerSimulator(SimulatorProfile(connect_latency=0.01, response_latency=0.01))
+    scheduler = ConnectionScheduler(slots_per_source=1)
+    device = make_device(simulator, 0, scheduler, "local", keep_connected=True)
+    with simulator.patch():
+        await device.update()
+        simulator.profile.drop_probability = 1.0
+        try:
+            await device.update()
+        except Exception:  # pylint: disable=broad-except
+            pass
+        simulator.profile.drop_probability = 0.0
+        # The slot of the dropped connection must have been released, or this waits forever.
+        await asyncio.wait_for(device.set_speed(4), 5)
+        await device.stop()
+    if simulator.controllers[device.address].work_type != WORK_TYPE_ON:
+        return "command after the dropped link did not reach the controller"
+    return None
+
+
+CHECKS: dict[str, Callable[[], Awaitable[str | None]]] = {
+    "commands coalesce into one session": check_coalescing,
+    "user commands run ahead of polls": check_priority,
+    "user commands being coalesced run ahead of polls": check_priority_while_coalescing,
+    "connections limited per source": check_scheduler,
+    "kept connections yield their slots": check_kept_connections_yield,
+    "recovery from a dropped link": check_dropped_link,
+}
+
+
+async def run_checks() -> bool:
+    passed = True
+    for name, check in CHECKS.items():
+        try:
+            failure = await asyncio.wait_for(check(), 30)
+        except Exception as ex:  # pylint: disable=broad-except
+            failure = repr(ex)
+        passed &= failure is None
+        print(f"{'PASS' if failure is None else 'FAIL'} {name}{'' if failure is None else ': ' + failure}")
+    return passed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=10)
+    parser.add_argument("--proxies", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--poll-every", type=float, default=2.0, help="seconds between polls per device")
+    parser.add_argument("--command-every", type=float, default=3.0, help="mean seconds between commands per device")
+    parser.add_argument("--connect-latency", type=float, default=0.5, help="seconds")
+    parser.add_argument("--response-latency", type=float, default=0.05, help="seconds")
+    parser.add_argument("--slow-probability", type=float, default=0.0)
+    parser.add_argument("--drop-probability", type=float, default=0.0)
+    parser.add_argument("--keep-connected", action="store_true")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--skip-checks", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    passed = True
+    if not args.skip_checks:
+        passed = asyncio.run(run_checks())
+    asyncio.run(run_load(args))
+    return int(not passed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
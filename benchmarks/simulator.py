@@ -0,0 +1,280 @@
+"""In-process simulator of AC Infinity controllers for load and latency testing.
+
+Replaces the Bleak connection used by ac_infinity_ble's ACInfinityController
+with simulated clients that speak the controller's GATT protocol: they
+answer get_model_data and the settings commands sent by ACInfinityDevice,
+with configurable connect latency, response latency, slow responses and
+dropped links. Any number of controllers can be simulated at once.
+
+    simulator = ControllerSimulator(SimulatorProfile(connect_latency=1.0))
+    controller = simulator.add_controller("AA:BB:CC:DD:EE:01")
+    with simulator.patch():
+        device = ACInfinityDevice(controller.ble_device, advertisement_data=controller.advertisement())
+        await device.update()
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+from unittest.mock import patch
+
+from ac_infinity_ble.const import (MANUFACTURER_ID,
+                                   POSSIBLE_READ_CHARACTERISTIC_UUIDS,
+                                   POSSIBLE_WRITE_CHARACTERISTIC_UUIDS)
+from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
+from bleak.exc import BleakError
+
+from custom_components.ac_infinity.encoder import crc16
+
+_HEAD = (165, 0)
+
+
+@dataclass
+class SimulatorProfile:
+    """Timing and failure behaviour of the simulated radio link."""
+
+    connect_latency: float = 0.5
+    response_latency: float = 0.05
+    # Probability that a response takes slow_response_latency instead.
+    slow_response_probability: float = 0.0
+    slow_response_latency: float = 3.0
+    # Probability, per command, that the link drops instead of answering.
+    drop_probability: float = 0.0
+    # Maximum simultaneous connections across all simulated controllers; None for no limit.
+    connection_slots: int | None = None
+    seed: int | None = None
+
+
+@dataclass
+class SimulatorStats:
+    connections: int = 0
+    rejected_connections: int = 0
+    commands: int = 0
+    drops: int = 0
+    slow_responses: int = 0
+    max_concurrent_connections: int = 0
+
+
+def _frame(sequence: int, frame_type: int, data: list[int]) -> bytearray:
+    """Build a frame the way Protocol._add_head does."""
+    frame = bytearray(len(data) + 12)
+    frame[0:2] = bytes(_HEAD)
+    frame[2:4] = len(data).to_bytes(2, "big")
+    frame[4:6] = sequence.to_bytes(2, "big")
+    frame[6:8] = crc16(frame[0:6]).to_bytes(2, "big")
+    frame[8] = 0
+    frame[9] = frame_type
+    frame[10:10 + len(data)] = bytes(data)
+    frame[10 + len(data):] = crc16(frame[8:10 + len(data)]).to_bytes(2, "big")
+    return frame
+
+
+@dataclass
+class SimulatedController:
+    """Device-side state of one simulated controller."""
+
+    address: str
+    device_type: int = 6
+    version: int = 3
+    work_type: int = 2
+    level_off: int = 1
+    level_on: int = 5
+    # Enabled-trigger bits as sent in the auto mode command: 8 high temp, 4 low temp, 2 high hum, 1 low hum.
+    auto_mode_switches: int = 0b1100
+    high_temp: int = 30
+    low_temp: int = 15
+    high_humidity: int = 70
+    low_humidity: int = 40
+    temperature: float = 23.45
+    humidity: float = 56.78
+    ble_device: BLEDevice = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.ble_device = BLEDevice(self.address, None, {}, -60)
+
+    @property
+    def fan(self) -> int:
+        return self.level_off if self.work_type == 1 else self.level_on
+
+    def manufacturer_data(self) -> bytes:
+        data = bytearray(23)
+        data[6:11] = self.address.replace(":", "")[-5:].encode("ascii")
+        data[11] = self.version
+        data[12] = self.device_type
+        data[13] = 0b00000010
+        data[14:16] = round(self.temperature * 100).to_bytes(2, "big", signed=True)
+        data[16:18] = round(self.humidity * 100).to_bytes(2, "big", signed=True)
+        data[18] = self.fan
+        data[19] = 1
+        data[21:23] = (123).to_bytes(2, "big", signed=True)
+        return bytes(data)
+
+    def advertisement(self) -> AdvertisementData:
+        return AdvertisementData(
+            local_name=None,
+            manufacturer_data={MANUFACTURER_ID: self.manufacturer_data()},
+            service_data={},
+            service_uuids=[],
+            tx_power=None,
+            rssi=-60,
+            platform_data=(),
+        )
+
+    def handle_frame(self, frame: bytes) -> bytearray:
+        """Apply a command frame and return the reply frame."""
+        sequence = int.from_bytes(frame[4:6], "big")
+        frame_type = frame[9]
+        data = frame[10:-2]
+        if frame_type == 1:
+            return self._model_data_reply(sequence)
+
+        command = data[0]
+        if command == 16:
+            self.work_type = data[2]
+            if len(data) >= 6 and data[3] == self.work_type + 16:
+                if self.work_type == 1:
+                    self.level_off = data[5]
+                else:
+                    self.level_on = data[5]
+        elif command == 17:
+            self.level_off = data[2]
+        elif command == 18:
+            self.level_on = data[2]
+        elif command == 19:
+            (self.auto_mode_switches, _, self.high_temp, _, self.low_temp,
+             self.high_humidity, self.low_humidity) = data[2:9]
+        return _frame(sequence, frame_type, [0, command])
+
+    def _model_data_reply(self, sequence: int) -> bytearray:
+        # Offsets of the reply, counted from the start of the frame, match decoder.py.
+        reply = [0] * 18
+        reply[2] = self.work_type
+        reply[5] = self.level_off
+        reply[8] = self.level_on
+        reply[11] = self.auto_mode_switches
+        reply[13] = self.high_temp
+        reply[15] = self.low_temp
+        reply[16] = self.high_humidity
+        reply[17] = self.low_humidity
+        return _frame(sequence, 1, reply)
+
+
+class _Characteristic:
+    def __init__(self, uuid: str) -> None:
+        self.uuid = uuid
+
+
+class _Services:
+    def __init__(self) -> None:
+        self._characteristics = {
+            uuid: _Characteristic(uuid)
+            for uuid in (POSSIBLE_READ_CHARACTERISTIC_UUIDS[0], POSSIBLE_WRITE_CHARACTERISTIC_UUIDS[0])
+        }
+
+    def get_characteristic(self, uuid: str) -> _Characteristic | None:
+        return self._characteristics.get(uuid)
+
+
+class SimulatedClient:
+    """Stands in for BleakClientWithServiceCache, connected to a simulated controller."""
+
+    def __init__(
+        self,
+        simulator: ControllerSimulator,
+        controller: SimulatedController,
+        disconnected_callback: Callable[[Any], None] | None,
+    ) -> None:
+        self._simulator = simulator
+        self._controller = controller
+        self._disconnected_callback = disconnected_callback
+        self._notify: Callable[[int, bytearray], None] | None = None
+        self.services = _Services()
+        self.is_connected = True
+
+    async def get_services(self) -> _Services:
+        return self.services
+
+    async def start_notify(self, char: _Characteristic, callback: Callable[[int, bytearray], None]) -> None:
+        self._notify = callback
+
+    async def stop_notify(self, char: _Characteristic) -> None:
+        self._notify = None
+
+    async def write_gatt_char(self, char: _Characteristic, data: bytes, response: bool = False) -> None:
+        if not self.is_connected:
+            raise BleakError("Not connected")
+        simulator = self._simulator
+        simulator.stats.commands += 1
+        if simulator.random.random() < simulator.profile.drop_probability:
+            simulator.stats.drops += 1
+            self._drop()
+            raise BleakError("Link dropped")
+
+        latency = simulator.profile.response_latency
+        if simulator.random.random() < simulator.profile.slow_response_probability:
+            simulator.stats.slow_responses += 1
+            latency = simulator.profile.slow_response_latency
+        reply = self._controller.handle_frame(data)
+        asyncio.get_running_loop().call_later(latency, self._reply, reply)
+
+    def _reply(self, reply: bytearray) -> None:
+        if self.is_connected and self._notify is not None:
+            self._notify(0, reply)
+
+    def _drop(self) -> None:
+        self._close()
+        if self._disconnected_callback is not None:
+            asyncio.get_running_loop().call_soon(self._disconnected_callback, self)
+
+    def _close(self) -> None:
+        if self.is_connected:
+            self.is_connected = False
+            self._simulator.connected -= 1
+
+    async def disconnect(self) -> bool:
+        self._close()
+        if self._disconnected_callback is not None:
+            self._disconnected_callback(self)
+        return True
+
+
+class ControllerSimulator:
+    """A set of simulated controllers sharing one simulated radio."""
+
+    def __init__(self, profile: SimulatorProfile | None = None) -> None:
+        self.profile = profile or SimulatorProfile()
+        self.random = random.Random(self.profile.seed)
+        self.controllers: dict[str, SimulatedController] = {}
+        self.stats = SimulatorStats()
+        self.connected = 0
+
+    def add_controller(self, address: str, **kwargs: Any) -> SimulatedController:
+        controller = self.controllers[address] = SimulatedController(address, **kwargs)
+        return controller
+
+    async def establish_connection(
+        self,
+        client_class: type,
+        device: BLEDevice,
+        name: str,
+        disconnected_callback: Callable[[Any], None] | None = None,
+        **kwargs: Any,
+    ) -> SimulatedClient:
+        """Drop-in replacement for bleak_retry_connector.establish_connection."""
+        await asyncio.sleep(self.profile.connect_latency)
+        slots = self.profile.connection_slots
+        if slots is not None and self.connected >= slots:
+            self.stats.rejected_connections += 1
+            raise BleakError(f"{name}: no free connection slot")
+        self.connected += 1
+        self.stats.connections += 1
+        self.stats.max_concurrent_connections = max(self.stats.max_concurrent_connections, self.connected)
+        return SimulatedClient(self, self.controllers[device.address], disconnected_callback)
+
+    def patch(self) -> Any:
+        """Context manager routing ACInfinityController connections to this simulator."""
+        return patch("ac_infinity_ble.device.establish_connection", self.establish_connection)
@@ -2,22 +2,34 @@ from __future__ import annotations
 
 import logging
 
-from ac_infinity_ble import DeviceInfo
 from homeassistant.components import bluetooth
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_ADDRESS, CONF_SERVICE_DATA, Platform
+from homeassistant.const import CONF_ADDRESS, CONF_SERVICE_DATA
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .capabilities import get_capabilities
+from .const import (CONF_IDLE_TIMEOUT, CONF_KEEP_CONNECTED,
+                    CONF_MAX_POLL_INTERVAL, DEFAULT_IDLE_TIMEOUT,
+                    DEFAULT_KEEP_CONNECTED, DEFAULT_MAX_POLL_INTERVAL, DOMAIN)
 from .coordinator import ACInfinityDataUpdateCoordinator
 from .device import ACInfinityDevice, DeviceInfoEx
 from .models import ACInfinityData
-
-PLATFORMS: list[Platform] = [Platform.FAN, Platform.NUMBER, Platform.SENSOR, Platform.SWITCH]
+from .scheduler import async_get_connection_scheduler
+from .services import async_setup_services
+from .snapshot import async_get_snapshot_store
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     address: str = entry.data[CONF_ADDRESS]
@@ -27,27 +39,55 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             f"Could not find AC Infinity device with address {address}"
         )
 
-    service_data = entry.data[CONF_SERVICE_DATA]
-    if type(service_data) is dict:
-        device_info = DeviceInfoEx(**service_data)
-    elif type(service_data) is DeviceInfoEx:
-        device_info = service_data
-    elif type(service_data) is DeviceInfo:
-        device_info = DeviceInfoEx.create(service_data)
+    snapshots = await async_get_snapshot_store(hass)
+    if restored_info := snapshots.restore(ble_device.address):
+        device_info = restored_info
     else:
-        raise ValueError(
-            f"Unexpected config entry service data type: {type(service_data)}"
-        )
+        device_info = DeviceInfoEx.from_dict(entry.data[CONF_SERVICE_DATA])
 
-    device = ACInfinityDevice(ble_device, device_info)
+    device = ACInfinityDevice(
+        ble_device,
+        device_info,
+        keep_connected=entry.options.get(CONF_KEEP_CONNECTED, DEFAULT_KEEP_CONNECTED),
+        idle_timeout=entry.options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT),
+        max_poll_interval=entry.options.get(CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL),
+        connection_scheduler=async_get_connection_scheduler(hass),
+    )
+    if restored_info:
+        device.defer_first_poll()
     coordinator = ACInfinityDataUpdateCoordinator(hass, _LOGGER, ble_device, device)
 
+    # Computed once, so the platforms unloaded are the ones set up even if
+    # the device later advertises a different firmware version.
+    capabilities = get_capabilities(device.state.type, device.state.version)
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = ACInfinityData(
-        entry.title, device, coordinator
+        entry.title, device, coordinator, capabilities
     )
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Only supported platforms are set up, so the modules of others are never imported.
+    await hass.config_entries.async_forward_entry_setups(entry, capabilities.platforms)
 
     entry.async_on_unload(coordinator.async_start())
+    entry.async_on_unload(snapshots.async_track(device))
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     return True
+
+
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    data: ACInfinityData = hass.data[DOMAIN][entry.entry_id]
+    if unload_ok := await hass.config_entries.async_unload_platforms(entry, data.capabilities.platforms):
+        hass.data[DOMAIN].pop(entry.entry_id)
+        await data.device.stop()
+
+    return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    snapshots = await async_get_snapshot_store(hass)
+    snapshots.async_remove(entry.data[CONF_ADDRESS].upper())
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry so changed options take effect."""
+    await hass.config_entries.async_reload(entry.entry_id)
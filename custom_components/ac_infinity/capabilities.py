@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import functools
+from dataclasses import dataclass, replace
+
+from homeassistant.const import Platform
+
+from .const import DEVICE_MODEL, FAMILY_E_MODELS, VPD_MIN_VERSION
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceCapabilities:
+    """What a device supports, and so which platforms and entities it gets."""
+
+    humidity: bool = True
+    vpd: bool = False
+    speed_limits: bool = True
+    auto_mode: bool = True
+
+    @property
+    def platforms(self) -> list[Platform]:
+        """The platforms to set up for the device, in setup order."""
+        platforms = [Platform.FAN]
+        if self.speed_limits or self.auto_mode:
+            platforms.append(Platform.NUMBER)
+        platforms.append(Platform.SENSOR)
+        if self.auto_mode:
+            platforms.append(Platform.SWITCH)
+        return platforms
+
+
+_MODEL_CAPABILITIES: dict[int, DeviceCapabilities] = {
+    1: DeviceCapabilities(),
+    6: DeviceCapabilities(humidity=False),  # Airtap has no humidity sensor
+    **{device_type: DeviceCapabilities() for device_type in FAMILY_E_MODELS},
+}
+# Settings of unknown models are not written, as their layout is unverified.
+_UNKNOWN_MODEL_CAPABILITIES = DeviceCapabilities(speed_limits=False, auto_mode=False)
+
+
+@functools.cache
+def get_capabilities(device_type: int, version: int) -> DeviceCapabilities:
+    """Return the capabilities of a device type running a firmware version."""
+    capabilities = _MODEL_CAPABILITIES.get(device_type, _UNKNOWN_MODEL_CAPABILITIES)
+    if device_type in FAMILY_E_MODELS and version >= VPD_MIN_VERSION:
+        capabilities = replace(capabilities, vpd=True)
+    return capabilities
+
+
+def get_model_name(device_type: int) -> str:
+    """Return the model name of a device type; types without a known name are named by number."""
+    return DEVICE_MODEL.get(device_type, f"Model {device_type}")
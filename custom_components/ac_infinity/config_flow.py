@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import asyncio
+import dataclasses
 import logging
 from typing import Any
 
-from ac_infinity_ble.const import MANUFACTURER_ID
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -12,19 +13,23 @@ from homeassistant.components.bluetooth import (
     async_discovered_service_info,
 )
 from homeassistant.const import CONF_ADDRESS, CONF_SERVICE_DATA
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import BLEAK_EXCEPTIONS, DOMAIN
-from .device import ACInfinityDevice, DeviceInfoEx
+from .const import (CONF_ADVERTISEMENT_ONLY, CONF_HUMIDITY_DEADBAND,
+                    CONF_HUMIDITY_MIN_INTERVAL, CONF_IDLE_TIMEOUT,
+                    CONF_KEEP_CONNECTED, CONF_MAX_POLL_INTERVAL,
+                    CONF_SENSOR_MAX_AGE, CONF_TEMPERATURE_DEADBAND,
+                    CONF_TEMPERATURE_MIN_INTERVAL, CONF_VPD_DEADBAND,
+                    CONF_VPD_MIN_INTERVAL, DEFAULT_DEADBAND,
+                    DEFAULT_IDLE_TIMEOUT, DEFAULT_KEEP_CONNECTED,
+                    DEFAULT_MAX_POLL_INTERVAL, DEFAULT_MIN_INTERVAL,
+                    DEFAULT_SENSOR_MAX_AGE, DOMAIN)
+from .discovery import async_get_discovery_cache
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def parse_manufacturer_data(data: bytes) -> DeviceInfoEx:
-    from ac_infinity_ble.protocol import parse_manufacturer_data as parse
-    return DeviceInfoEx.create(parse(data))
-
-
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
@@ -33,6 +38,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._discovery_info: BluetoothServiceInfoBleak | None = None
         self._discovered_devices: dict[str, BluetoothServiceInfoBleak] = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return OptionsFlow()
+
     async def async_step_bluetooth(
         self, discovery_info: BluetoothServiceInfoBleak
     ) -> FlowResult:
@@ -40,17 +53,22 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         await self.async_set_unique_id(discovery_info.address)
         self._abort_if_unique_id_configured()
         self._discovery_info = discovery_info
-        device: DeviceInfoEx = parse_manufacturer_data(
-            discovery_info.advertisement.manufacturer_data[MANUFACTURER_ID]
-        )
+        device = async_get_discovery_cache(self.hass).parse(discovery_info)
         self.context["title_placeholders"] = {"name": device.name}
         return await self.async_step_user()
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle the user step to pick discovered device."""
+        """Handle the user step to pick discovered device.
+
+        Unless only the advertisement is used, the chosen device must answer a
+        connectivity probe. When the device list is shown to the user, all
+        listed devices are probed in the background, so that the probe of the
+        chosen one is usually done by the time it is submitted.
+        """
         errors: dict[str, str] = {}
+        discovery_cache = async_get_discovery_cache(self.hass)
 
         if user_input is not None:
             address = user_input[CONF_ADDRESS]
@@ -59,27 +77,21 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 discovery_info.address, raise_on_progress=False
             )
             self._abort_if_unique_id_configured()
-            controller = ACInfinityDevice(
-                discovery_info.device, advertisement_data=discovery_info.advertisement
-            )
-            try:
-                await controller.update()
-            except BLEAK_EXCEPTIONS:
-                errors["base"] = "cannot_connect"
-            except Exception:  # pylint: disable=broad-except
-                _LOGGER.exception("Unexpected error")
-                errors["base"] = "unknown"
+            if user_input[CONF_ADVERTISEMENT_ONLY]:
+                error = None
+            else:
+                # Shielded, as the probe is shared with other flows.
+                error = await asyncio.shield(discovery_cache.async_probe(discovery_info))
+            if error is not None:
+                errors["base"] = error
             else:
-                await controller.stop()
+                device = discovery_cache.parse(discovery_info)
+                discovery_cache.async_forget(discovery_info.address)
                 return self.async_create_entry(
-                    title=controller.name,
+                    title=device.name,
                     data={
                         CONF_ADDRESS: discovery_info.address,
-                        CONF_SERVICE_DATA: parse_manufacturer_data(
-                            discovery_info.advertisement.manufacturer_data[
-                                MANUFACTURER_ID
-                            ]
-                        ),
+                        CONF_SERVICE_DATA: dataclasses.asdict(device),
                     },
                 )
 
@@ -102,14 +114,17 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         devices = {}
         for service_info in self._discovered_devices.values():
-            device = parse_manufacturer_data(
-                service_info.advertisement.manufacturer_data[MANUFACTURER_ID]
-            )
+            device = discovery_cache.parse(service_info)
             devices[service_info.address] = f"{device.name} ({service_info.address})"
+            # Discovery flows reach this form without the user, so only a
+            # user looking at the list starts probes before a device is chosen.
+            if self.source == config_entries.SOURCE_USER:
+                discovery_cache.async_probe(service_info)
 
         data_schema = vol.Schema(
             {
                 vol.Required(CONF_ADDRESS): vol.In(devices),
+                vol.Required(CONF_ADVERTISEMENT_ONLY, default=False): bool,
             }
         )
         return self.async_show_form(
@@ -117,3 +132,48 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=data_schema,
             errors=errors,
         )
+
+
+class OptionsFlow(config_entries.OptionsFlow):
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the connection and sensor publishing options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_KEEP_CONNECTED,
+                    default=options.get(CONF_KEEP_CONNECTED, DEFAULT_KEEP_CONNECTED),
+                ): bool,
+                vol.Required(
+                    CONF_IDLE_TIMEOUT,
+                    default=options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                vol.Required(
+                    CONF_MAX_POLL_INTERVAL,
+                    default=options.get(CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=30, max=86400)),
+                **{
+                    vol.Required(
+                        key, default=options.get(key, DEFAULT_DEADBAND)
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10))
+                    for key in (CONF_TEMPERATURE_DEADBAND, CONF_HUMIDITY_DEADBAND, CONF_VPD_DEADBAND)
+                },
+                **{
+                    vol.Required(
+                        key, default=options.get(key, DEFAULT_MIN_INTERVAL)
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600))
+                    for key in (CONF_TEMPERATURE_MIN_INTERVAL, CONF_HUMIDITY_MIN_INTERVAL, CONF_VPD_MIN_INTERVAL)
+                },
+                vol.Required(
+                    CONF_SENSOR_MAX_AGE,
+                    default=options.get(CONF_SENSOR_MAX_AGE, DEFAULT_SENSOR_MAX_AGE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=data_schema)
@@ -7,6 +7,35 @@ MANUFACTURER = "AC Infinity"
 DEVICE_TIMEOUT = 30
 UPDATE_SECONDS = 15
 
+CONF_KEEP_CONNECTED = "keep_connected"
+CONF_IDLE_TIMEOUT = "idle_timeout"
+CONF_MAX_POLL_INTERVAL = "max_poll_interval"
+# Config flow: add a device from its advertisement alone, without connecting.
+CONF_ADVERTISEMENT_ONLY = "advertisement_only"
+
+CONF_TEMPERATURE_DEADBAND = "temperature_deadband"
+CONF_HUMIDITY_DEADBAND = "humidity_deadband"
+CONF_VPD_DEADBAND = "vpd_deadband"
+CONF_TEMPERATURE_MIN_INTERVAL = "temperature_min_interval"
+CONF_HUMIDITY_MIN_INTERVAL = "humidity_min_interval"
+CONF_VPD_MIN_INTERVAL = "vpd_min_interval"
+CONF_SENSOR_MAX_AGE = "sensor_max_age"
+
+DEFAULT_KEEP_CONNECTED = False
+DEFAULT_IDLE_TIMEOUT = 60
+DEFAULT_MAX_POLL_INTERVAL = 600
+# Sensor publishing limits; 0 disables each, so every change is published.
+DEFAULT_DEADBAND = 0.0
+DEFAULT_MIN_INTERVAL = 0
+DEFAULT_SENSOR_MAX_AGE = 0
+
+# Concurrent connections this integration opens per Bluetooth adapter or proxy.
+# ESPHome proxies have three connection slots by default; one is left for others.
+MAX_CONNECTIONS_PER_SOURCE = 2
+
+# Range of fan speed levels.
+SPEED_RANGE = (1, 10)
+
 BLEAK_EXCEPTIONS = (AttributeError, BleakError, TimeoutError)
 
 DEVICE_MODEL = {1: "Controller 67",
@@ -15,3 +44,5 @@ DEVICE_MODEL = {1: "Controller 67",
                 11: "Controller 69 Pro"}
 
 FAMILY_E_MODELS = {7, 9, 11, 12}
+# Firmware version from which family E controllers advertise VPD.
+VPD_MIN_VERSION = 3
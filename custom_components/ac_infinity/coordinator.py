@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import functools
 import logging
+from typing import Any
 
 import async_timeout
 from ac_infinity_ble.const import MANUFACTURER_ID
 from bleak.backends.device import BLEDevice
+from bluetooth_data_tools import monotonic_time_coarse
 from homeassistant.components import bluetooth
 from homeassistant.components.bluetooth.active_update_coordinator import \
     ActiveBluetoothDataUpdateCoordinator
@@ -14,12 +17,23 @@ from homeassistant.helpers.update_coordinator import (
     BaseCoordinatorEntity
 )
 from homeassistant.core import CoreState, HomeAssistant, callback
+from homeassistant.util import slugify
 
 from .device import ACInfinityDevice
 
 DEVICE_STARTUP_TIMEOUT = 30
 
 
+@functools.cache
+def entity_key(name: str) -> str:
+    """Return the slug of an entity name used in unique IDs.
+
+    Cached, as every device has entities of the same names and slugifying is
+    a noticeable part of setting up a config entry.
+    """
+    return slugify(name)
+
+
 class ACInfinityDataUpdateCoordinator(ActiveBluetoothDataUpdateCoordinator[None]):
 
     def __init__(
@@ -82,6 +96,7 @@ class ACInfinityDataUpdateCoordinator(ActiveBluetoothDataUpdateCoordinator[None]
         if MANUFACTURER_ID not in service_info.advertisement.manufacturer_data:
             return
         self.ble_device = service_info.device
+        self.controller.connection_source = service_info.source
         self.controller.set_ble_device_and_advertisement_data(
             service_info.device, service_info.advertisement
         )
@@ -92,6 +107,13 @@ class ACInfinityDataUpdateCoordinator(ActiveBluetoothDataUpdateCoordinator[None]
                           self.ble_device.address,
                           self.controller.state)
         super()._async_handle_bluetooth_event(service_info, change)
+        # service_info.time comes from the same coarse monotonic clock.
+        self.controller.metrics.advertisement.record(monotonic_time_coarse() - service_info.time)
+
+    @property
+    def device_reachable(self) -> bool:
+        """Whether recent connections to the device have not failed repeatedly."""
+        return not self.controller.failure_policy.is_open
 
     async def async_wait_ready(self) -> bool:
         """Wait for the device to be ready."""
@@ -103,12 +125,21 @@ class ACInfinityDataUpdateCoordinator(ActiveBluetoothDataUpdateCoordinator[None]
 
 
 class ActiveBluetoothCoordinatorEntity[
-    _ActiveBluetoothDataUpdateCoordinatorT: ActiveBluetoothDataUpdateCoordinator = ActiveBluetoothDataUpdateCoordinator
+    _ACInfinityDataUpdateCoordinatorT: ACInfinityDataUpdateCoordinator = ACInfinityDataUpdateCoordinator
 ](
-    BaseCoordinatorEntity[_ActiveBluetoothDataUpdateCoordinatorT]
+    BaseCoordinatorEntity[_ACInfinityDataUpdateCoordinatorT]
 ):
-    """A class for entities using an ActiveBluetoothDataUpdateCoordinator and whose availability should include
-    whether the last Bluetooth poll was successful."""
+    """A class for entities using an ACInfinityDataUpdateCoordinator, available while the device is advertising.
+
+    Availability deliberately ignores failed connections: Home Assistant does
+    not pass service calls on to unavailable entities, and a user command is
+    the quickest way to find out whether the device can be reached again.
+
+    State is written only when what the entity publishes changes, as most
+    advertisements change nothing that a given entity shows.
+    """
+
+    _last_published: tuple[Any, ...] | None = None
 
     async def async_update(self) -> None:
         """Only allow updates via the coordinator, not on demand."""
@@ -116,4 +147,29 @@ class ActiveBluetoothCoordinatorEntity[
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.available and self.coordinator.last_poll_successful
+        return self.coordinator.available
+
+    @callback
+    def _update_attrs(self) -> None:
+        """Handle updating _attr values."""
+        raise NotImplementedError("Not yet implemented.")
+
+    @callback
+    def _published_state(self) -> tuple[Any, ...]:
+        """The values whose changes are written to Home Assistant's state."""
+        return (self.available,)
+
+    @callback
+    def _should_publish(self, published: tuple[Any, ...]) -> bool:
+        """Whether to write `published`, given the last written `_last_published`."""
+        return published != self._last_published
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator, writing state only if it changed."""
+        self._update_attrs()
+        published = self._published_state()
+        if not self._should_publish(published):
+            return
+        self._last_published = published
+        super()._handle_coordinator_update()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import struct
+from collections.abc import Mapping
+
+
+class ModelDataLayout:
+    """Byte offsets of the settings in a get_model_data reply.
+
+    All fields are single bytes. Replies long enough for the whole layout are
+    decoded in one struct pass; shorter replies decode the fields they contain.
+    """
+
+    __slots__ = ("_fields", "_names", "_struct")
+
+    def __init__(self, offsets: Mapping[str, int]) -> None:
+        self._fields = tuple(sorted(offsets.items(), key=lambda item: item[1]))
+        self._names = tuple(name for name, _ in self._fields)
+        fmt = ">"
+        position = 0
+        for _, offset in self._fields:
+            fmt += f"{offset - position}xB"
+            position = offset + 1
+        self._struct = struct.Struct(fmt)
+
+    @property
+    def size(self) -> int:
+        """Length of a reply containing every field of the layout."""
+        return self._struct.size
+
+    def decode(self, data: bytes) -> dict[str, int]:
+        """Decode the fields present in `data`."""
+        if len(data) >= self._struct.size:
+            return dict(zip(self._names, self._struct.unpack_from(data)))
+        return {name: data[offset] for name, offset in self._fields if offset < len(data)}
+
+
+SETTINGS_FIELDS = ("work_type", "level_off", "level_on")
+AUTO_MODE_FIELDS = (
+    "auto_mode_flags",
+    "high_temp",
+    "low_temp",
+    "high_humidity",
+    "low_humidity",
+)
+
+# Every known model family replies with this layout.
+MODEL_DATA_LAYOUT = ModelDataLayout(
+    {
+        "work_type": 12,
+        "level_off": 15,
+        "level_on": 18,
+        "auto_mode_flags": 21,
+        "high_temp": 23,
+        "low_temp": 25,
+        "high_humidity": 26,
+        "low_humidity": 27,
+    }
+)
@@ -1,18 +1,37 @@
 from __future__ import annotations
 
+import asyncio
 import dataclasses
+import heapq
+import itertools
 import logging
+import struct
+import time
+import zlib
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 from ac_infinity_ble import ACInfinityController, DeviceInfo
 from ac_infinity_ble.const import CallbackType, MANUFACTURER_ID
-from ac_infinity_ble.protocol import parse_manufacturer_data
-from ac_infinity_ble.util import get_bit
+from ac_infinity_ble.protocol import get_type
+from ac_infinity_ble.util import get_bit, get_bits
 from bleak.backends.device import BLEDevice
 from bleak.backends.scanner import AdvertisementData
+from bleak_retry_connector import BleakClientWithServiceCache
 
-from .const import FAMILY_E_MODELS
+from .const import (DEFAULT_IDLE_TIMEOUT, DEFAULT_MAX_POLL_INTERVAL,
+                    FAMILY_E_MODELS, VPD_MIN_VERSION)
+from .decoder import AUTO_MODE_FIELDS, MODEL_DATA_LAYOUT, SETTINGS_FIELDS
+from .encoder import CommandEncoder, FrameTemplate, get_encoder
+from .failure_policy import FailurePolicy
+from .framelog import (FRAME_ADVERTISEMENT, FRAME_COMMAND, FRAME_NOTIFICATION,
+                       FrameLog)
+from .metrics import DeviceMetrics
+from .rolling import DeviceStatistics
+
+if TYPE_CHECKING:
+    from .scheduler import ConnectionScheduler
 
 WORK_TYPE_OFF = 1
 WORK_TYPE_ON = 2
@@ -20,18 +39,105 @@ WORK_TYPE_AUTO = 3
 
 _LOGGER = logging.getLogger(ACInfinityController.__module__)
 _MIN_SECONDS_BETWEEN_POLLS = 30
+_POLL_BACKOFF_FACTOR = 2
+_POLL_JITTER = 0.1
+# Longest delay of the first poll after restoring a state snapshot.
+_MAX_FIRST_POLL_DEFERRAL = 10 * _MIN_SECONDS_BETWEEN_POLLS
+_COMMAND_COALESCE_SECONDS = 0.25
+# Deadlines after which a connection attempt, or a whole queued operation, is abandoned.
+_CONNECT_DEADLINE = 30
+_OPERATION_DEADLINE = 60
+
+# Operation priorities; user commands run before background polls.
+_PRIORITY_USER = 0
+_PRIORITY_POLL = 1
+
+# Temperature and humidity (signed, 1/100 units) and fan level at offset 14.
+_ADVERTISEMENT_READINGS = struct.Struct(">hhB")
+_SHORT = struct.Struct(">h")
+
+
+def _is_reply_to(frame: bytes, reply: bytes | None) -> bool:
+    """Return whether `reply` acknowledges the command `frame`.
+
+    Replies carry the same frame head as commands, including the sequence
+    number in bytes 4-5.
+    """
+    return (
+        reply is not None
+        and len(reply) >= 6
+        and reply[0] == frame[0]
+        and reply[4:6] == frame[4:6]
+    )
+
+
+@dataclass(slots=True)
+class DeviceInfoEx:
+    """Device state: the fields of ac_infinity_ble's DeviceInfo plus polled configuration.
+
+    Unlike DeviceInfo this is slotted and updated in place from advertisements.
+    """
+
+    type: int
+    name: str
+    version: int
+    is_degree: bool | None = None
+    tmp_state: int | None = None
+    hum_state: int | None = None
+    vpd_state: int | None = None
+    choose_port: int | None = None
+    tmp: float | None = None
+    hum: float | None = None
+    vpd: float | None = None
+    fan_type: int | None = None
+    fan_state: int | None = None
+    fan: int | None = None
+    work_type: int | None = None
+    level_on: int | None = None
+    level_off: int | None = None
+    auto_mode: Optional[AutoModeConfig] = None
 
-
-@dataclass
-class DeviceInfoEx(DeviceInfo):
     @staticmethod
-    def create(device_info: DeviceInfo) -> DeviceInfoEx:
-        return DeviceInfoEx(**device_info.__dict__)
-
-    auto_mode: Optional[AutoModeConfig] = None
+    def create(device_info: DeviceInfo | DeviceInfoEx) -> DeviceInfoEx:
+        return DeviceInfoEx(
+            **{field.name: getattr(device_info, field.name) for field in dataclasses.fields(device_info)}
+        )
 
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> DeviceInfoEx:
+        """Create from the dict form stored in config entries."""
+        auto_mode = data.get("auto_mode")
+        return DeviceInfoEx(
+            **{**data, "auto_mode": None if auto_mode is None else AutoModeConfig(**auto_mode)}
+        )
 
-@dataclass
+    def update_from_manufacturer_data(self, data: bytes) -> None:
+        """Update the advertised fields in place from raw manufacturer data.
+
+        Mirrors ac_infinity_ble.protocol.parse_manufacturer_data without
+        allocating an intermediate DeviceInfo.
+        """
+        device_type = data[12]
+        version = data[11]
+        if device_type != self.type or version != self.version:
+            self.type = device_type
+            self.version = version
+            self.name = f"{get_type(device_type)}-{data[6:11].decode('ascii')}"
+        flags = data[13]
+        self.is_degree = True ^ get_bit(flags, 1)
+        self.fan_state = get_bits(flags, 2, 2)
+        self.tmp_state = get_bits(flags, 4, 2)
+        self.hum_state = get_bits(flags, 6, 2)
+        tmp, hum, self.fan = _ADVERTISEMENT_READINGS.unpack_from(data, 14)
+        self.tmp = tmp / 100
+        self.hum = hum / 100
+        if version >= VPD_MIN_VERSION and device_type in FAMILY_E_MODELS:
+            self.choose_port = data[19]
+            self.vpd_state = get_bits(data[20], 0, 2)
+            self.vpd = _SHORT.unpack_from(data, 21)[0] / 100
+
+
+@dataclass(slots=True)
 class AutoModeConfig:
     high_temp_enabled: bool
     high_temp: int
@@ -43,14 +149,30 @@ class AutoModeConfig:
     low_humidity: int
 
 
+@dataclass(frozen=True, slots=True)
+class DeviceConfig:
+    """The settings of a device that are set by the user rather than measured."""
+
+    work_type: int | None
+    level_off: int | None
+    level_on: int | None
+    auto_mode: AutoModeConfig | None
+
+
 class ACInfinityDevice(ACInfinityController):
     _config_changed_since_last_update = False
+    # Whether the last poll reply lacked some settings, so a change could not be confirmed.
+    _last_poll_partial = False
 
     def __init__(
         self,
         ble_device: BLEDevice,
         state: DeviceInfoEx | None = None,
         advertisement_data: AdvertisementData | None = None,
+        keep_connected: bool = False,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+        connection_scheduler: ConnectionScheduler | None = None,
     ):
         super().__init__(
             ble_device=ble_device,
@@ -58,22 +180,76 @@ class ACInfinityDevice(ACInfinityController):
             advertisement_data=advertisement_data,
         )
 
-        if self._state is DeviceInfo:
-            self._state = DeviceInfoEx(**self._state.__dict__)
+        if not isinstance(self._state, DeviceInfoEx):
+            self._state = DeviceInfoEx.create(self._state)
+
+        self._keep_connected = keep_connected
+        self._idle_timeout = idle_timeout
+        self._pending_writes: dict[int, tuple[FrameTemplate, tuple[int, ...], Callable[[], None]]] = {}
+        self._pending_auto_mode: AutoModeConfig | None = None
+        self._flush_task: asyncio.Task[None] | None = None
+        self._operations: list[tuple[int, int, Callable[[], Awaitable[None]], asyncio.Future[None]]] = []
+        self._operation_counter = itertools.count()
+        self._operation_worker: asyncio.Task[None] | None = None
+        self._reclaim_task: asyncio.Task[None] | None = None
+        self._queued_poll: asyncio.Future[None] | None = None
+        self._last_manufacturer_data: bytes | None = None
+        self._max_poll_interval = max(max_poll_interval, _MIN_SECONDS_BETWEEN_POLLS)
+        self._poll_interval: float = _MIN_SECONDS_BETWEEN_POLLS
+        self._poll_phase = zlib.crc32(ble_device.address.upper().encode()) / 0xFFFFFFFF
+        self._first_poll_due: float | None = None
+        self._connection_scheduler = connection_scheduler
+        self._slot_lock = asyncio.Lock()
+        self._slot_source: str | None = None
+        # Adapter or proxy the device was last heard on; connections are scheduled per source.
+        self.connection_source: str | None = None
+        self.metrics = DeviceMetrics()
+        self.frame_log = FrameLog()
+        self.failure_policy = FailurePolicy()
+        self.statistics = DeviceStatistics()
 
     def set_ble_device_and_advertisement_data(
         self, ble_device: BLEDevice, advertisement_data: AdvertisementData
     ) -> None:
         self._ble_device = ble_device
         self._advertisement_data = advertisement_data
-        info = parse_manufacturer_data(
-            advertisement_data.manufacturer_data[MANUFACTURER_ID]
-        )
-        self._state = dataclasses.replace(
-            self._state, **{k: v for k, v in dataclasses.asdict(info).items() if v is not None}
-        )
+        manufacturer_data = advertisement_data.manufacturer_data[MANUFACTURER_ID]
+        if manufacturer_data == self._last_manufacturer_data:
+            # Most advertisements repeat the previous payload; nothing to decode,
+            # unless the state has been changed otherwise since it was decoded.
+            return
+        self._last_manufacturer_data = manufacturer_data
+        self.frame_log.record(FRAME_ADVERTISEMENT, manufacturer_data)
+        state = self._state
+        state.update_from_manufacturer_data(manufacturer_data)
+        self.statistics.add(state.tmp, state.hum, state.vpd, time.monotonic())
+        if self._advertised_fan_contradicts_settings():
+            self._reset_poll_interval()
         self._fire_callbacks(CallbackType.ADVERTISEMENT)
 
+    def _invalidate_advertisement(self) -> None:
+        """Decode the next advertisement even if it repeats the last payload.
+
+        Called whenever the state changes other than by an advertisement, by a
+        command, notification or poll, so that the advertised readings are
+        applied again and checked against the new settings.
+        """
+        self._last_manufacturer_data = None
+
+    def _advertised_fan_contradicts_settings(self) -> bool:
+        """Whether the advertised fan level disagrees with the last polled settings.
+
+        In on and off modes the fan runs at the max and min speed respectively,
+        so a different advertised level means the settings were changed
+        elsewhere, e.g. on the device itself.
+        """
+        state = self._state
+        if state.work_type == WORK_TYPE_ON:
+            return state.level_on is not None and state.fan != state.level_on
+        if state.work_type == WORK_TYPE_OFF:
+            return state.level_off is not None and state.fan != state.level_off
+        return False
+
     @property
     def speed(self) -> Optional[int]:
         """Get the speed of the device."""
@@ -110,18 +286,293 @@ class ACInfinityDevice(ACInfinityController):
     def state(self) -> DeviceInfoEx:
         return self._state
 
+    @property
+    def keep_connected(self) -> bool:
+        """Whether the connection is held open between operations."""
+        return self._keep_connected
+
+    def _reset_disconnect_timer(self) -> None:
+        """Reset the idle disconnect timer using the configured idle timeout."""
+        if self._disconnect_timer:
+            self._disconnect_timer.cancel()
+        self._expected_disconnect = False
+        self._disconnect_timer = self.loop.call_later(
+            self._idle_timeout, self._disconnect
+        )
+
+    async def _execute_timed_disconnect(self) -> None:
+        """Execute disconnection after the idle timeout."""
+        if self._operation_worker is not None:
+            # Still in use; check again after another idle timeout.
+            self._reset_disconnect_timer()
+            return
+        _LOGGER.debug(
+            "%s: Disconnecting after idle timeout of %ss",
+            self.name,
+            self._idle_timeout,
+        )
+        await self._execute_disconnect()
+
+    def _disconnected(self, client: BleakClientWithServiceCache) -> None:
+        """Forget a dropped connection so the next operation reconnects."""
+        super()._disconnected(client)
+        if self._client is not client:
+            return
+        self._client = None
+        self._read_char = None
+        self._write_char = None
+        if self._disconnect_timer:
+            self._disconnect_timer.cancel()
+            self._disconnect_timer = None
+        self._release_connection_slot()
+
+    async def _acquire_connection_slot(self) -> None:
+        """Wait for a connection slot on the device's current source."""
+        if self._connection_scheduler is None or self.connection_source is None:
+            return
+        async with self._slot_lock:
+            if self._slot_source is None:
+                source = self.connection_source
+                await self._connection_scheduler.acquire(source)
+                self._slot_source = source
+
+    def _release_connection_slot(self) -> None:
+        if self._slot_source is not None:
+            self._connection_scheduler.unpark(self._slot_source, self._reclaim_idle_slot)
+            self._connection_scheduler.release(self._slot_source)
+            self._slot_source = None
+
+    def _reclaim_idle_slot(self) -> bool:
+        """Disconnect to hand the connection slot to a waiting device, unless busy."""
+        if self._operation_worker is not None or self._slot_source is None:
+            return False
+        _LOGGER.debug("%s: Disconnecting to free a connection slot on %s", self.name, self._slot_source)
+        self._reclaim_task = self.loop.create_task(self._disconnect_idle())
+        return True
+
+    async def _disconnect_idle(self) -> None:
+        # Holding the slot lock makes an operation queued meanwhile wait for
+        # the disconnect, then queue for a slot again behind the waiting device.
+        try:
+            async with self._slot_lock:
+                await self._execute_disconnect()
+        finally:
+            self._reclaim_task = None
+
+    async def _ensure_connected(self) -> None:
+        """Ensure connection to device is established, within a free connection slot."""
+        if self._client and self._client.is_connected:
+            self._reset_disconnect_timer()
+            return
+        with self.metrics.connect.time():
+            await self._acquire_connection_slot()
+            try:
+                async with asyncio.timeout(_CONNECT_DEADLINE):
+                    await super()._ensure_connected()
+            except BaseException:
+                if not (self._client and self._client.is_connected):
+                    self._release_connection_slot()
+                raise
+
+    async def _execute_disconnect(self) -> None:
+        """Execute disconnection and give up the connection slot.
+
+        The idle timer is cancelled, so that it does not disconnect again
+        later, and only disconnecting a client is recorded in the metrics.
+        """
+        if self._disconnect_timer:
+            self._disconnect_timer.cancel()
+            self._disconnect_timer = None
+        try:
+            if self._client is None:
+                await super()._execute_disconnect()
+                return
+            with self.metrics.disconnect.time():
+                await super()._execute_disconnect()
+        finally:
+            self._release_connection_slot()
+
+    async def _release_connection(self) -> None:
+        """Release the connection at the end of an operation.
+
+        In keep-connected mode the link stays open and is closed by the idle
+        timer, or as soon as another device needs the connection slot;
+        otherwise it is closed right away.
+        """
+        if (
+            self._keep_connected
+            and self._client
+            and self._client.is_connected
+            and not self._slot_wanted()
+        ):
+            self._reset_disconnect_timer()
+            if self._slot_source is not None:
+                self._connection_scheduler.park(self._slot_source, self._reclaim_idle_slot)
+            return
+        await self._execute_disconnect()
+
+    def _slot_wanted(self) -> bool:
+        return self._slot_source is not None and self._connection_scheduler.has_waiters(self._slot_source)
+
+    @property
+    def poll_interval(self) -> float:
+        """Current interval between polls of the settings not present in advertisements."""
+        return self._poll_interval
+
+    def _reset_poll_interval(self) -> None:
+        """Poll at the shortest interval again, e.g. after the settings changed.
+
+        A deferred first poll is brought forward to within the shortest
+        interval as well.
+        """
+        self._poll_interval = _MIN_SECONDS_BETWEEN_POLLS
+        if self._first_poll_due is not None:
+            self._first_poll_due = min(
+                self._first_poll_due, time.monotonic() + self._poll_phase * _MIN_SECONDS_BETWEEN_POLLS
+            )
+
+    def _back_off_poll_interval(self) -> None:
+        """Poll less often, e.g. after a poll found the settings unchanged."""
+        self._poll_interval = min(self._poll_interval * _POLL_BACKOFF_FACTOR, self._max_poll_interval)
+
+    def _polled_settings(self) -> tuple:
+        return (self.state.work_type, self.state.level_off, self.state.level_on, self.state.auto_mode)
+
+    def defer_first_poll(self) -> None:
+        """Defer the first poll because the state was restored from a recent snapshot.
+
+        First polls are then spread across the maximum poll interval, up to
+        _MAX_FIRST_POLL_DEFERRAL, rather than the minimum one. An advertisement
+        contradicting the restored settings brings the first poll forward.
+        """
+        deferral = min(self._max_poll_interval, _MAX_FIRST_POLL_DEFERRAL)
+        self._first_poll_due = time.monotonic() + self._poll_phase * deferral
+
     def update_needed(self, seconds_since_last_update: Optional[float | int]) -> bool:
-        return (self._config_changed_since_last_update or
-                seconds_since_last_update is None or seconds_since_last_update > _MIN_SECONDS_BETWEEN_POLLS)
+        """Whether the device should be polled now.
+
+        Each device has a stable phase derived from its address. The first poll
+        is delayed by that fraction of the minimum poll interval, and every poll
+        interval is stretched by up to _POLL_JITTER of its length, so that
+        devices started together do not all connect at the same moment.
+        """
+        if not self.failure_policy.attempt_allowed():
+            return False
+        if self._config_changed_since_last_update and not self._last_poll_partial:
+            # Confirm the change right away; after a partial reply, at the usual interval.
+            return True
+        if seconds_since_last_update is None:
+            now = time.monotonic()
+            if self._first_poll_due is None:
+                self._first_poll_due = now + self._poll_phase * _MIN_SECONDS_BETWEEN_POLLS
+            return now >= self._first_poll_due
+        return seconds_since_last_update > self._poll_interval * (1 + _POLL_JITTER * self._poll_phase)
+
+    def _enqueue_operation(
+        self, priority: int, operation: Callable[[], Awaitable[None]]
+    ) -> asyncio.Future[None]:
+        """Queue an operation that uses the connection; operations run one at a time.
+
+        Operations with a lower priority value run first; operations with the
+        same priority run in order of arrival.
+        """
+        future: asyncio.Future[None] = self.loop.create_future()
+        heapq.heappush(self._operations, (priority, next(self._operation_counter), operation, future))
+        if self._operation_worker is None:
+            self._operation_worker = self.loop.create_task(self._process_operations())
+        return future
+
+    async def _process_operations(self) -> None:
+        """Run queued operations one at a time.
+
+        Each operation gets a connection slot first, and _OPERATION_DEADLINE
+        only starts once it has one. Time spent queued behind other devices
+        is not the device's fault, so it never counts toward its failures.
+        """
+        try:
+            while self._operations:
+                priority, _, operation, future = heapq.heappop(self._operations)
+                if future.done():
+                    continue
+                if future is self._queued_poll:
+                    self._queued_poll = None
+                try:
+                    await self._acquire_connection_slot()
+                    try:
+                        async with asyncio.timeout(_OPERATION_DEADLINE):
+                            await operation()
+                    finally:
+                        if not (self._client and self._client.is_connected):
+                            self._release_connection_slot()
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                except Exception as ex:  # pylint: disable=broad-except
+                    if priority == _PRIORITY_POLL:
+                        self.metrics.poll_failures += 1
+                    self.failure_policy.record_failure()
+                    if self.failure_policy.is_open:
+                        _LOGGER.debug(
+                            "%s: %s consecutive failures; next attempt in %.0fs",
+                            self.name,
+                            self.failure_policy.failures,
+                            self.failure_policy.retry_in(),
+                        )
+                    future.set_exception(ex)
+                else:
+                    if priority == _PRIORITY_POLL:
+                        self.metrics.poll_successes += 1
+                    self.failure_policy.record_success()
+                    future.set_result(None)
+        finally:
+            self._operation_worker = None
+            for *_, future in self._operations:
+                future.cancel()
+            self._operations.clear()
+
+    async def stop(self) -> None:
+        """Stop the device, dropping queued operations, and disconnect."""
+        for task in (self._flush_task, self._operation_worker, self._reclaim_task):
+            if task is not None:
+                task.cancel()
+        await super().stop()
 
     async def update(self) -> None:
-        """Poll the device to update state date, including data not present in BLE advertisements."""
+        """Poll the device to update state date, including data not present in BLE advertisements.
+
+        Polls run after any queued user commands, including commands still
+        waiting out the coalescing window, which are not in the operation queue
+        yet. A poll requested while another is still queued waits for that one
+        instead of queuing a second.
+        """
+        queued_at = time.monotonic()
+        if self._queued_poll is None and (flush := self._flush_task) is not None:
+            await asyncio.wait([flush])
+        if self._queued_poll is None:
+            self._queued_poll = self._enqueue_operation(
+                _PRIORITY_POLL, lambda: self._timed_update(queued_at)
+            )
+        await asyncio.shield(self._queued_poll)
+
+    async def _timed_update(self, queued_at: float) -> None:
+        """Poll, recording the latency including time spent queued.
+
+        The outcome is counted by _process_operations, which also sees polls
+        that exceed the operation deadline.
+        """
+        try:
+            await self._update()
+        finally:
+            self.metrics.update.record(time.monotonic() - queued_at)
+
+    async def _update(self) -> None:
         await self._ensure_connected()
         try:
             _LOGGER.debug("%s: Updating model data", self.name)
-            command = self._protocol.get_model_data(self.state.type, 0, self.sequence)
+            command = self.encoder.model_data.encode(self.sequence)
             if data := await self._send_command(command):
-                if len(data) < 28:
+                values = MODEL_DATA_LAYOUT.decode(data)
+                if not values:
                     _LOGGER.debug(
                         "%s: Skipping update; data too short (%s): %s",
                         self.name,
@@ -129,76 +580,222 @@ class ACInfinityDevice(ACInfinityController):
                         data.hex()
                     )
                 else:
-                    self.state.work_type = data[12]
-                    self.state.level_off = data[15]
-                    self.state.level_on = data[18]
-
-                    self.state.auto_mode = AutoModeConfig(
-                        high_temp_enabled=not get_bit(data[21], 4),
-                        low_temp_enabled=not get_bit(data[21], 5),
-                        high_humidity_enabled=not get_bit(data[21], 6),
-                        low_humidity_enabled=not get_bit(data[21], 7),
-                        high_temp=data[23],
-                        low_temp=data[25],
-                        high_humidity=data[26],
-                        low_humidity=data[27],
-                    )
-
-                    self._config_changed_since_last_update = False
+                    previous_settings = self._polled_settings()
+                    partial = len(values) < len(SETTINGS_FIELDS) + len(AUTO_MODE_FIELDS)
+                    if partial:
+                        _LOGGER.debug(
+                            "%s: Partially decoded model data (%s): %s",
+                            self.name,
+                            len(data),
+                            data.hex()
+                        )
+                    for field in SETTINGS_FIELDS:
+                        if field in values:
+                            setattr(self.state, field, values[field])
+
+                    if all(field in values for field in AUTO_MODE_FIELDS):
+                        flags = values["auto_mode_flags"]
+                        self.state.auto_mode = AutoModeConfig(
+                            high_temp_enabled=not get_bit(flags, 4),
+                            low_temp_enabled=not get_bit(flags, 5),
+                            high_humidity_enabled=not get_bit(flags, 6),
+                            low_humidity_enabled=not get_bit(flags, 7),
+                            high_temp=values["high_temp"],
+                            low_temp=values["low_temp"],
+                            high_humidity=values["high_humidity"],
+                            low_humidity=values["low_humidity"],
+                        )
+
+                    if self._config_changed_since_last_update or self._polled_settings() != previous_settings:
+                        self._reset_poll_interval()
+                    else:
+                        self._back_off_poll_interval()
+                    # A changed setting is only confirmed by a reply containing all of them.
+                    if not partial:
+                        self._config_changed_since_last_update = False
+                    self._last_poll_partial = partial
+                    self._invalidate_advertisement()
                     self._fire_callbacks(CallbackType.UPDATE_RESPONSE)
         finally:
-            await self._execute_disconnect()
+            await self._release_connection()
+
+    async def _send_command(self, command: bytes, retry: int | None = None) -> bytes | None:
+        """Send command to device and read response."""
+        self.frame_log.record(FRAME_COMMAND, command)
+        with self.metrics.send.time():
+            return await super()._send_command(command, retry)
+
+    async def _execute_command_locked(self, command: bytes) -> bytes:
+        """Execute command and read response, reconnecting first if the link was dropped.
+
+        A failed attempt disconnects before the library retries the command, so
+        the retry has to reconnect.
+        """
+        if not (self._client and self._client.is_connected):
+            await self._ensure_connected()
+        return await super()._execute_command_locked(command)
+
+    def _notification_handler(self, _sender: int, data: bytearray) -> None:
+        """Handle notification responses."""
+        self.frame_log.record(FRAME_NOTIFICATION, data)
+        self._invalidate_advertisement()
+        super()._notification_handler(_sender, data)
+
+    @property
+    def encoder(self) -> CommandEncoder:
+        """Command frame encoder for this device's model type."""
+        return get_encoder(self.state.type)
+
+    async def _queue_write(
+        self,
+        template: FrameTemplate,
+        values: tuple[int, ...],
+        apply: Callable[[], None],
+        unchanged: bool = False,
+    ) -> None:
+        """Queue a settings command and wait until it has been sent.
+
+        Commands queued within _COMMAND_COALESCE_SECONDS of each other are sent
+        in a single connection session. A later command for the same setting
+        replaces an earlier, not yet sent one. `apply` updates the local state
+        once the command has been sent; a follow-up poll is only scheduled if
+        the device does not acknowledge the command.
+
+        If `unchanged`, the state already matches the command, and it is
+        skipped unless a different command for the same setting is queued.
+        """
+        if unchanged and template.command not in self._pending_writes:
+            _LOGGER.debug("%s: Skipping command %s; already set to %s", self.name, template.command, values)
+            return
+        self._pending_writes[template.command] = (template, values, apply)
+        if self._flush_task is None:
+            self._flush_task = self.loop.create_task(self._flush_writes())
+        await asyncio.shield(self._flush_task)
+
+    async def _flush_writes(self) -> None:
+        """Send all queued settings commands once the coalescing window has passed."""
+        await asyncio.sleep(_COMMAND_COALESCE_SECONDS)
+        await asyncio.shield(self._enqueue_operation(_PRIORITY_USER, self._send_queued_writes))
+
+    async def _send_queued_writes(self) -> None:
+        """Send all queued settings commands in one connection session."""
+        writes = self._pending_writes
+        pending_auto_mode = self._pending_auto_mode
+        self._pending_writes = {}
+        self._flush_task = None
+
+        _LOGGER.debug("%s: Sending %s queued command(s)", self.name, len(writes))
+        try:
+            # Inside the try, so that a failed connection also drops the
+            # pending auto mode configuration and later edits do not resend it.
+            await self._ensure_connected()
+            for template, values, apply in writes.values():
+                frame = template.encode(self.sequence, *values)
+                reply = await self._send_command(frame)
+                apply()
+                self._invalidate_advertisement()
+                self._reset_poll_interval()
+                if not _is_reply_to(frame, reply):
+                    _LOGGER.debug(
+                        "%s: No matching reply to %s (%s); polling to confirm",
+                        self.name,
+                        frame.hex(),
+                        reply.hex() if reply else None,
+                    )
+                    self._config_changed_since_last_update = True
+                    self._last_poll_partial = False
+        finally:
+            if self._pending_auto_mode is pending_auto_mode:
+                self._pending_auto_mode = None
+            await self._release_connection()
+
+    async def _set_level(self, work_type: int, level: int) -> None:
+        """Switch to on or off mode, running the fan at `level`.
+
+        The level is stored as level_on or level_off, according to the mode.
+        """
+        if level not in range(0, 11):
+            raise ValueError("Level must be between 0 and 10")
+        state = self.state
+        level_field = "level_off" if work_type == WORK_TYPE_OFF else "level_on"
+
+        def apply() -> None:
+            state.work_type = work_type
+            state.fan = level
+            setattr(state, level_field, level)
+
+        await self._queue_write(
+            self.encoder.level,
+            (work_type, work_type + 16, 1, level),
+            apply,
+            unchanged=state.work_type == work_type and state.fan == level and getattr(state, level_field) == level,
+        )
+
+    async def turn_on(self, speed: int | None = None) -> None:
+        """Turn on the device, optionally at the given speed."""
+        _LOGGER.debug("%s: Turn on", self.name)
+        if speed is None:
+            speed = self.state.level_on or 10
+        await self._set_level(WORK_TYPE_ON, speed)
+
+    async def turn_off(self) -> None:
+        """Turn off the device."""
+        _LOGGER.debug("%s: Turn off", self.name)
+        await self._set_level(WORK_TYPE_OFF, self.state.level_off or 0)
+
+    async def set_speed(self, speed: int) -> None:
+        """Set the speed of the device; a speed of 0 turns it off."""
+        _LOGGER.debug("%s: Set speed to %s", self.name, speed)
+        await self._set_level(WORK_TYPE_ON if speed > 0 else WORK_TYPE_OFF, speed)
 
     async def set_mode_auto(self) -> None:
         """Set the device's mode to automatic."""
-        await self._ensure_connected()
         _LOGGER.debug("%s: Setting mode to auto", self.name)
 
-        command = [16, 1, WORK_TYPE_AUTO]
-        if self.state.type in FAMILY_E_MODELS:
-            command += [255, 0]
-        command = self._protocol._add_head(command, 3, self.sequence)
-        await self._ensure_connected()
-        try:
-            await self._send_command(command)
-
+        def apply() -> None:
             self.state.work_type = WORK_TYPE_AUTO
-            self._config_changed_since_last_update = True
-        finally:
-            await self._execute_disconnect()
 
-    async def async_set_auto_high_temp(self, value: float) -> None:
-        if self.auto_mode is None:
+        await self._queue_write(
+            self.encoder.work_type,
+            (WORK_TYPE_AUTO,),
+            apply,
+            unchanged=self.state.work_type == WORK_TYPE_AUTO,
+        )
+
+    def _auto_mode_for_edit(self) -> AutoModeConfig:
+        """Return the auto mode configuration that a single-field edit applies to.
+
+        This is the queued configuration if one is waiting to be sent, so that
+        several edits made in quick succession are merged into one command.
+        """
+        config = self._pending_auto_mode or self.auto_mode
+        if config is None:
             raise ValueError("Auto mode configuration is not loaded; cannot change configuration values")
+        return config
 
-        new_config = dataclasses.replace(self.auto_mode, high_temp=round(value))
+    async def async_set_auto_high_temp(self, value: float) -> None:
+        new_config = dataclasses.replace(self._auto_mode_for_edit(), high_temp=round(value))
         await self.async_set_auto_mode_config(new_config)
 
     async def async_set_auto_low_temp(self, value: float) -> None:
-        if self.auto_mode is None:
-            raise ValueError("Auto mode configuration is not loaded; cannot change configuration values")
-
-        new_config = dataclasses.replace(self.auto_mode, low_temp=round(value))
+        new_config = dataclasses.replace(self._auto_mode_for_edit(), low_temp=round(value))
         await self.async_set_auto_mode_config(new_config)
 
     async def async_set_auto_mode_high_temp_enabled(self, enabled: bool) -> None:
-        if self.auto_mode is None:
-            raise ValueError("Auto mode configuration is not loaded; cannot change configuration values")
-
-        new_config = dataclasses.replace(self.auto_mode, high_temp_enabled=enabled)
+        new_config = dataclasses.replace(self._auto_mode_for_edit(), high_temp_enabled=enabled)
         await self.async_set_auto_mode_config(new_config)
 
     async def async_set_auto_mode_low_temp_enabled(self, enabled: bool) -> None:
-        if self.auto_mode is None:
-            raise ValueError("Auto mode configuration is not loaded; cannot change configuration values")
-
-        new_config = dataclasses.replace(self.auto_mode, low_temp_enabled=enabled)
+        new_config = dataclasses.replace(self._auto_mode_for_edit(), low_temp_enabled=enabled)
         await self.async_set_auto_mode_config(new_config)
 
     async def async_set_auto_mode_config(self, config: AutoModeConfig) -> None:
         if config is None:
             raise ValueError("config cannot be None")
         _LOGGER.debug("%s: Setting auto mode config to %s", self.name, config)
+        if self._pending_auto_mode is None and self.state.auto_mode == config:
+            _LOGGER.debug("%s: Skipping auto mode config; already set", self.name)
+            return
 
         def byte_for_temp_hum_enabled_switches(config: AutoModeConfig) -> int:
             b = 8 if config.high_temp_enabled else 0
@@ -221,24 +818,65 @@ class ACInfinityDevice(ACInfinityController):
         low_temp_f = round(c_to_f(config.low_temp))
         low_temp_c = config.low_temp
 
-        command = [19, 7,
-                   temp_hum_enabled_switches,
-                   high_temp_f, high_temp_c,
-                   low_temp_f, low_temp_c,
-                   config.high_humidity,
-                   config.low_humidity]
-        if self.state.type in FAMILY_E_MODELS:
-            command += [255, 0]
-        command = self._protocol._add_head(command, 3, self.sequence)
-
-        await self._ensure_connected()
-        try:
-            await self._send_command(command)
+        values = (temp_hum_enabled_switches,
+                  high_temp_f, high_temp_c,
+                  low_temp_f, low_temp_c,
+                  config.high_humidity,
+                  config.low_humidity)
 
+        def apply() -> None:
             self.state.auto_mode = config
-            self._config_changed_since_last_update = True
-        finally:
-            await self._execute_disconnect()
+
+        self._pending_auto_mode = config
+        await self._queue_write(self.encoder.auto_mode, values, apply)
+
+    @property
+    def config(self) -> DeviceConfig:
+        """The current settings, e.g. to restore later with async_restore_config."""
+        state = self.state
+        return DeviceConfig(state.work_type, state.level_off, state.level_on, state.auto_mode)
+
+    async def async_restore_config(self, config: DeviceConfig) -> tuple[list[str], list[str]]:
+        """Restore saved settings, sending commands only for the settings that differ.
+
+        Settings that are None in `config` are left alone. Only off, on and
+        auto mode can be set, and off and on mode only together with their
+        level, so a saved mode is skipped otherwise. Returns the names of the
+        settings that differed and were restored, and of those that differed
+        but were skipped.
+        """
+        current = self.config
+        differing = [
+            field.name
+            for field in dataclasses.fields(DeviceConfig)
+            if (value := getattr(config, field.name)) is not None and value != getattr(current, field.name)
+        ]
+        writes = []
+        written: set[str] = set()
+        if config.work_type in (WORK_TYPE_ON, WORK_TYPE_OFF):
+            # The level command of on and off mode also sets that mode's level.
+            level_field = "level_on" if config.work_type == WORK_TYPE_ON else "level_off"
+            if (level := getattr(config, level_field)) is not None:
+                writes.append(self._set_level(config.work_type, level))
+                written.update(("work_type", level_field))
+        elif config.work_type == WORK_TYPE_AUTO:
+            writes.append(self.set_mode_auto())
+            written.add("work_type")
+        if config.level_off is not None and "level_off" not in written:
+            writes.append(self.async_set_min_speed(config.level_off))
+            written.add("level_off")
+        if config.level_on is not None and "level_on" not in written:
+            writes.append(self.async_set_max_speed(config.level_on))
+            written.add("level_on")
+        if config.auto_mode is not None:
+            writes.append(self.async_set_auto_mode_config(config.auto_mode))
+            written.add("auto_mode")
+        await asyncio.gather(*writes)
+        changed = [name for name in differing if name in written]
+        skipped = [name for name in differing if name not in written]
+        if skipped:
+            _LOGGER.debug("%s: Not restoring %s of %s", self.name, ", ".join(skipped), config)
+        return changed, skipped
 
     async def async_set_min_speed(self, value: int) -> None:
         """Set the minimum fan speed for auto and other dynamic modes."""
@@ -247,19 +885,10 @@ class ACInfinityDevice(ACInfinityController):
 
         _LOGGER.debug("%s: Setting min speed to %s", self.name, value)
 
-        command = [17, 1, value]
-        if self.state.type in FAMILY_E_MODELS:
-            command += [255, 0]
-        command = self._protocol._add_head(command, 3, self.sequence)
-
-        await self._ensure_connected()
-        try:
-            await self._send_command(command)
-
+        def apply() -> None:
             self.state.level_off = value
-            self._config_changed_since_last_update = True
-        finally:
-            await self._execute_disconnect()
+
+        await self._queue_write(self.encoder.min_speed, (value,), apply, self.state.level_off == value)
 
     async def async_set_max_speed(self, value: int) -> None:
         """Set the maximum fan speed for auto and other dynamic modes."""
@@ -268,16 +897,7 @@ class ACInfinityDevice(ACInfinityController):
 
         _LOGGER.debug("%s: Setting max speed to %s", self.name, value)
 
-        command = [18, 1, value]
-        if self.state.type in FAMILY_E_MODELS:
-            command += [255, 0]
-        command = self._protocol._add_head(command, 3, self.sequence)
+        def apply() -> None:
+            self.state.level_on = value
 
-        await self._ensure_connected()
-        try:
-            await self._send_command(command)
-
-            self.state.level_off = value
-            self._config_changed_since_last_update = True
-        finally:
-            await self._execute_disconnect()
+        await self._queue_write(self.encoder.max_speed, (value,), apply, self.state.level_on == value)
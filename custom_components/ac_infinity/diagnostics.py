@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import dataclasses
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .metrics import LatencyWindow
+from .models import ACInfinityData
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry, including the recent raw frames."""
+    data: ACInfinityData = hass.data[DOMAIN][entry.entry_id]
+    device = data.device
+    metrics: dict[str, Any] = {}
+    for field in dataclasses.fields(device.metrics):
+        value = getattr(device.metrics, field.name)
+        if isinstance(value, LatencyWindow):
+            summary = value.summary()
+            value = None if summary is None else {
+                "p50_ms": round(summary[0] * 1000),
+                "p95_ms": round(summary[1] * 1000),
+                "max_ms": round(summary[2] * 1000),
+                "samples": value.count,
+            }
+        metrics[field.name] = value
+
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "device": {
+            "state": dataclasses.asdict(device.state),
+            "connection_source": device.connection_source,
+            "keep_connected": device.keep_connected,
+            "poll_interval": device.poll_interval,
+            "rssi": device.rssi,
+        },
+        "coordinator": {
+            "available": data.coordinator.available,
+            "last_poll_successful": data.coordinator.last_poll_successful,
+            "device_reachable": data.coordinator.device_reachable,
+            "consecutive_failures": device.failure_policy.failures,
+        },
+        "metrics": metrics,
+        "frames": device.frame_log.as_dicts(),
+    }
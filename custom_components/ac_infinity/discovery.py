@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from ac_infinity_ble.const import MANUFACTURER_ID
+from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+
+from .const import BLEAK_EXCEPTIONS, DOMAIN
+from .device import ACInfinityDevice, DeviceInfoEx
+from .scheduler import async_get_connection_scheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_DISCOVERY_CACHE = f"{DOMAIN}_discovery_cache"
+
+# How long a successful probe is trusted before the device is probed again.
+PROBE_RESULT_TTL = 300
+
+
+def parse_manufacturer_data(data: bytes) -> DeviceInfoEx:
+    from ac_infinity_ble.protocol import parse_manufacturer_data as parse
+    return DeviceInfoEx.create(parse(data))
+
+
+class DiscoveryCache:
+    """Parsed advertisements and connectivity probes of discovered devices, per address.
+
+    Shared by all config flows, so that an advertisement is only parsed again
+    when its payload changes, and each device is probed once, in the
+    background and in parallel with the others, however often the list of
+    devices is shown.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._parsed: dict[str, tuple[bytes, DeviceInfoEx]] = {}
+        self._probes: dict[str, tuple[float, asyncio.Task[str | None]]] = {}
+
+    def parse(self, service_info: BluetoothServiceInfoBleak) -> DeviceInfoEx:
+        """Return the device info advertised by a discovered device."""
+        data = service_info.advertisement.manufacturer_data[MANUFACTURER_ID]
+        cached = self._parsed.get(service_info.address)
+        if cached is not None and cached[0] == data:
+            return cached[1]
+        device = parse_manufacturer_data(data)
+        self._parsed[service_info.address] = (data, device)
+        return device
+
+    @callback
+    def async_probe(self, service_info: BluetoothServiceInfoBleak) -> asyncio.Task[str | None]:
+        """Return the probe of a device, starting one unless one is running or recently succeeded.
+
+        The probe connects and polls the device, and results in None on
+        success or the config flow error otherwise. Failed probes are not
+        reused, so that retrying probes the device again.
+        """
+        address = service_info.address
+        if (probe := self._probes.get(address)) is not None:
+            started, task = probe
+            if not task.done() or (
+                not task.cancelled()
+                and task.result() is None
+                and time.monotonic() - started < PROBE_RESULT_TTL
+            ):
+                return task
+        task = self._hass.async_create_background_task(
+            self._async_probe(service_info), f"{DOMAIN} probe {address}"
+        )
+        self._probes[address] = (time.monotonic(), task)
+        return task
+
+    async def _async_probe(self, service_info: BluetoothServiceInfoBleak) -> str | None:
+        controller = ACInfinityDevice(
+            service_info.device,
+            advertisement_data=service_info.advertisement,
+            connection_scheduler=async_get_connection_scheduler(self._hass),
+        )
+        # Probes share the per-adapter connection limit with configured devices.
+        controller.connection_source = service_info.source
+        try:
+            await controller.update()
+        except BLEAK_EXCEPTIONS as ex:
+            _LOGGER.debug("%s: Probe failed: %s", service_info.address, ex)
+            return "cannot_connect"
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Unexpected error")
+            return "unknown"
+        finally:
+            await controller.stop()
+        return None
+
+    @callback
+    def async_forget(self, address: str) -> None:
+        """Drop what is cached for a device, once it has been configured."""
+        self._parsed.pop(address, None)
+        self._probes.pop(address, None)
+
+
+@singleton(DATA_DISCOVERY_CACHE)
+@callback
+def async_get_discovery_cache(hass: HomeAssistant) -> DiscoveryCache:
+    """Return the discovery cache shared by all config flows."""
+    return DiscoveryCache(hass)
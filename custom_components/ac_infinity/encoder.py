@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import functools
+from collections.abc import Sequence
+
+from .const import FAMILY_E_MODELS
+
+FRAME_TYPE_QUERY = 1
+FRAME_TYPE_SETTING = 3
+
+_HEAD = (165, 0)
+
+
+def _make_crc_table() -> tuple[int, ...]:
+    table = []
+    for i in range(256):
+        crc = i << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else crc << 1
+        table.append(crc & 0xFFFF)
+    return tuple(table)
+
+
+_CRC_TABLE = _make_crc_table()
+
+
+def crc16(data: Sequence[int], crc: int = 0xFFFF) -> int:
+    """CRC-16/CCITT-FALSE, continuing from `crc`; equivalent to ac_infinity_ble.util.crc16."""
+    for b in data:
+        crc = ((crc << 8) & 0xFFFF) ^ _CRC_TABLE[((crc >> 8) ^ b) & 0xFF]
+    return crc
+
+
+class FrameTemplate:
+    """Precomputed frame for one command, filled in with a sequence number and values.
+
+    Produces the same frames as ac_infinity_ble's Protocol._add_head. The CRCs
+    of the constant parts of the frame are computed once, when the template is
+    built.
+    """
+
+    __slots__ = (
+        "command",
+        "value_count",
+        "_body_crc",
+        "_frame",
+        "_head_crc",
+        "_trailer",
+        "_values_offset",
+    )
+
+    def __init__(
+        self,
+        frame_type: int,
+        prefix: Sequence[int],
+        value_count: int = 0,
+        trailer: Sequence[int] = (),
+    ) -> None:
+        self.command = prefix[0]
+        self.value_count = value_count
+        self._trailer = tuple(trailer)
+        length = len(prefix) + value_count + len(self._trailer)
+
+        frame = bytearray(length + 12)
+        frame[0:2] = bytes(_HEAD)
+        frame[2] = (length >> 8) & 255
+        frame[3] = length & 255
+        frame[8] = 0
+        frame[9] = frame_type
+        frame[10:10 + len(prefix)] = bytes(prefix)
+        self._values_offset = 10 + len(prefix)
+        frame[self._values_offset + value_count:10 + length] = bytes(self._trailer)
+
+        self._frame = frame
+        self._head_crc = crc16(frame[0:4])
+        self._body_crc = crc16(frame[8:self._values_offset])
+
+    def encode(self, sequence: int, *values: int) -> bytes:
+        """Return the frame for `sequence` with `values` filled in."""
+        if len(values) != self.value_count:
+            raise ValueError(f"Expected {self.value_count} values, got {len(values)}")
+        frame = self._frame
+        frame[4] = (sequence >> 8) & 255
+        frame[5] = sequence & 255
+        head_crc = crc16(frame[4:6], self._head_crc)
+        frame[6] = head_crc >> 8
+        frame[7] = head_crc & 255
+
+        end = self._values_offset + self.value_count
+        frame[self._values_offset:end] = bytes(values)
+        body_crc = crc16(self._trailer, crc16(values, self._body_crc))
+        frame[end + len(self._trailer)] = body_crc >> 8
+        frame[end + len(self._trailer) + 1] = body_crc & 255
+        return bytes(frame)
+
+
+class CommandEncoder:
+    """Frame templates for the commands sent to one model type."""
+
+    __slots__ = (
+        "auto_mode",
+        "level",
+        "max_speed",
+        "min_speed",
+        "model_data",
+        "work_type",
+    )
+
+    def __init__(self, device_type: int) -> None:
+        trailer = (255, 0) if device_type in FAMILY_E_MODELS else ()
+        self.model_data = FrameTemplate(FRAME_TYPE_QUERY, (16, 17, 18, 19, 20, 21, 22, 23), 0, trailer)
+        # work type
+        self.work_type = FrameTemplate(FRAME_TYPE_SETTING, (16, 1), 1, trailer)
+        # work type, work type + 16, 1, level
+        self.level = FrameTemplate(FRAME_TYPE_SETTING, (16, 1), 4, trailer)
+        self.min_speed = FrameTemplate(FRAME_TYPE_SETTING, (17, 1), 1, trailer)
+        self.max_speed = FrameTemplate(FRAME_TYPE_SETTING, (18, 1), 1, trailer)
+        # switches, high °F, high °C, low °F, low °C, high humidity, low humidity
+        self.auto_mode = FrameTemplate(FRAME_TYPE_SETTING, (19, 7), 7, trailer)
+
+
+@functools.cache
+def get_encoder(device_type: int) -> CommandEncoder:
+    """Return the shared encoder for a device type."""
+    return CommandEncoder(device_type)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import random
+import time
+
+# Delay before retrying after the first failure; doubled after each further failure.
+BACKOFF_INITIAL = 30
+BACKOFF_MAX = 300
+BACKOFF_JITTER = 0.2
+# Consecutive failures after which the device is considered unreachable. The
+# circuit then opens: only an occasional probe is attempted in the background,
+# while user commands are still sent.
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_PROBE_INTERVAL = 600
+
+
+class FailurePolicy:
+    """Decides when to attempt connecting to a device again after failures.
+
+    After each consecutive failure the next attempt is delayed exponentially,
+    with random jitter so that devices failing together do not retry together.
+    After CIRCUIT_FAILURE_THRESHOLD failures the circuit opens and attempts
+    are limited to one probe every CIRCUIT_PROBE_INTERVAL. Any success closes
+    the circuit and clears the delay.
+    """
+
+    __slots__ = ("failures", "_next_attempt")
+
+    def __init__(self) -> None:
+        self.failures = 0
+        self._next_attempt = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the device is considered unreachable."""
+        return self.failures >= CIRCUIT_FAILURE_THRESHOLD
+
+    def attempt_allowed(self) -> bool:
+        """Whether a background attempt, such as a poll, may be made now."""
+        return time.monotonic() >= self._next_attempt
+
+    def retry_in(self) -> float:
+        """Seconds until the next attempt is allowed."""
+        return max(0.0, self._next_attempt - time.monotonic())
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._next_attempt = 0.0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.is_open:
+            delay = CIRCUIT_PROBE_INTERVAL
+        else:
+            delay = min(BACKOFF_INITIAL * 2 ** (self.failures - 1), BACKOFF_MAX)
+        self._next_attempt = time.monotonic() + delay * (1 + random.uniform(0, BACKOFF_JITTER))
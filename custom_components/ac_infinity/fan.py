@@ -9,19 +9,17 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.util import slugify
 from homeassistant.util.percentage import (int_states_in_range,
                                            percentage_to_ranged_value,
                                            ranged_value_to_percentage)
 
-from .const import DEVICE_MODEL, DOMAIN, MANUFACTURER
+from .capabilities import get_model_name
+from .const import DOMAIN, MANUFACTURER, SPEED_RANGE
 from .coordinator import (ACInfinityDataUpdateCoordinator,
-                          ActiveBluetoothCoordinatorEntity)
+                          ActiveBluetoothCoordinatorEntity, entity_key)
 from .device import WORK_TYPE_AUTO, ACInfinityDevice
 from .models import ACInfinityData
 
-SPEED_RANGE = (1, 10)
-
 PRESET_AUTO_MODE = "Auto"
 
 
@@ -56,14 +54,15 @@ class ACInfinityFan(
         super().__init__(coordinator)
         self._device = device
         self._attr_name = name
-        self._attr_unique_id = f"{self._device.address}_{slugify(name)}"
+        self._attr_unique_id = f"{self._device.address}_{entity_key(name)}"
         self._attr_device_info = DeviceInfo(
             name=device.name,
-            model=DEVICE_MODEL[device.state.type],
+            model=get_model_name(device.state.type),
             manufacturer=MANUFACTURER,
             sw_version=device.state.version,
             connections={(dr.CONNECTION_BLUETOOTH, device.address)},
         )
+        self._update_attrs()
 
     async def async_set_percentage(self, percentage: int) -> None:
         """Set the speed of the fan, as a percentage."""
@@ -110,7 +109,5 @@ class ACInfinityFan(
         )
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._update_attrs()
-        super()._handle_coordinator_update()
+    def _published_state(self) -> tuple[Any, ...]:
+        return (self.available, self._attr_is_on, self._attr_preset_mode, self._attr_percentage)
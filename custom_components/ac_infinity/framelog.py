@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import collections
+import time
+from datetime import UTC, datetime
+from typing import Any
+
+# Number of most recent frames kept per device.
+FRAME_LOG_SIZE = 200
+
+FRAME_COMMAND = "command"
+FRAME_NOTIFICATION = "notification"
+FRAME_ADVERTISEMENT = "advertisement"
+
+
+class FrameLog:
+    """Ring buffer of the most recent raw frames exchanged with a device.
+
+    Holds command frames, notifications (including command replies) and
+    changed manufacturer data payloads, each with the time it was seen.
+    Recording only appends a reference to the bytes; they are formatted when
+    the log is read for diagnostics.
+    """
+
+    __slots__ = ("_frames",)
+
+    def __init__(self, size: int = FRAME_LOG_SIZE) -> None:
+        self._frames: collections.deque[tuple[float, str, bytes]] = collections.deque(maxlen=size)
+
+    def record(self, kind: str, data: bytes) -> None:
+        self._frames.append((time.time(), kind, data))
+
+    def as_dicts(self) -> list[dict[str, Any]]:
+        """Return the frames, oldest first, with ISO timestamps and hex payloads."""
+        return [
+            {
+                "time": datetime.fromtimestamp(timestamp, UTC).isoformat(),
+                "kind": kind,
+                "data": data.hex(),
+            }
+            for timestamp, kind, data in self._frames
+        ]
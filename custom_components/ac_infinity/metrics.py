@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+# Number of most recent samples each latency window summarizes.
+LATENCY_WINDOW_SIZE = 100
+
+
+class LatencyWindow:
+    """Rolling window of the most recent latency samples, in seconds.
+
+    Recording a sample is a deque append; the percentiles are computed when
+    first read after a new sample and cached until the next one.
+    """
+
+    __slots__ = ("count", "_samples", "_summary")
+
+    def __init__(self, size: int = LATENCY_WINDOW_SIZE) -> None:
+        self.count = 0
+        self._samples: collections.deque[float] = collections.deque(maxlen=size)
+        self._summary: tuple[float, float, float] | None = None
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self.count += 1
+        self._summary = None
+
+    @contextlib.contextmanager
+    def time(self) -> Iterator[None]:
+        """Record the duration of the block, whether or not it raises."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(time.monotonic() - start)
+
+    def summary(self) -> tuple[float, float, float] | None:
+        """Return the (p50, p95, max) of the window, or None if it is empty."""
+        if self._summary is None and self._samples:
+            ordered = sorted(self._samples)
+            last = len(ordered) - 1
+            self._summary = (ordered[last // 2], ordered[round(last * 0.95)], ordered[last])
+        return self._summary
+
+
+@dataclass(slots=True)
+class DeviceMetrics:
+    """Latencies and poll outcomes of one device."""
+
+    # Waiting for a connection slot and connecting.
+    connect: LatencyWindow = field(default_factory=LatencyWindow)
+    # Sending a command and receiving its reply.
+    send: LatencyWindow = field(default_factory=LatencyWindow)
+    disconnect: LatencyWindow = field(default_factory=LatencyWindow)
+    # A whole poll, from being queued until done.
+    update: LatencyWindow = field(default_factory=LatencyWindow)
+    # From an advertisement being received until entities were updated from it.
+    advertisement: LatencyWindow = field(default_factory=LatencyWindow)
+    poll_successes: int = 0
+    poll_failures: int = 0
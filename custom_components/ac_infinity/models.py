@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from .capabilities import DeviceCapabilities
 from .device import ACInfinityDevice
 from .coordinator import ACInfinityDataUpdateCoordinator
 
@@ -11,3 +12,4 @@ class ACInfinityData:
     title: str
     device: ACInfinityDevice
     coordinator: ACInfinityDataUpdateCoordinator
+    capabilities: DeviceCapabilities
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import math
 from collections.abc import Awaitable, Callable
-from typing import Optional
+from typing import Any, Optional
 
 from homeassistant.components.number import NumberDeviceClass, NumberEntity
 from homeassistant.config_entries import ConfigEntry
@@ -11,15 +11,14 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.util import slugify
 from homeassistant.util.percentage import (percentage_to_ranged_value,
                                            ranged_value_to_percentage)
 
-from .const import DEVICE_MODEL, DOMAIN, MANUFACTURER
+from .capabilities import get_model_name
+from .const import DOMAIN, MANUFACTURER, SPEED_RANGE
 from .coordinator import (ACInfinityDataUpdateCoordinator,
-                          ActiveBluetoothCoordinatorEntity)
+                          ActiveBluetoothCoordinatorEntity, entity_key)
 from .device import ACInfinityDevice
-from .fan import SPEED_RANGE
 from .models import ACInfinityData
 
 
@@ -29,28 +28,33 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     data: ACInfinityData = hass.data[DOMAIN][entry.entry_id]
-    entities: list[ACInfinityNumber] = [
-        PercentageNumber(data.coordinator,
-                         data.device,
-                         "Min Speed",
-                         lambda d: d.min_speed,
-                         ACInfinityDevice.async_set_min_speed),
-        PercentageNumber(data.coordinator,
-                         data.device,
-                         "Max Speed",
-                         lambda d: d.max_speed,
-                         ACInfinityDevice.async_set_max_speed),
-        TemperatureNumber(data.coordinator,
-                          data.device,
-                          "Auto Mode High Temperature",
-                          lambda d: None if d.auto_mode is None else d.auto_mode.high_temp,
-                          ACInfinityDevice.async_set_auto_high_temp),
-        TemperatureNumber(data.coordinator,
-                          data.device,
-                          "Auto Mode Low Temperature",
-                          lambda d: None if d.auto_mode is None else d.auto_mode.low_temp,
-                          ACInfinityDevice.async_set_auto_low_temp),
-    ]
+    entities: list[ACInfinityNumber] = []
+    if data.capabilities.speed_limits:
+        entities.extend((
+            PercentageNumber(data.coordinator,
+                             data.device,
+                             "Min Speed",
+                             lambda d: d.min_speed,
+                             ACInfinityDevice.async_set_min_speed),
+            PercentageNumber(data.coordinator,
+                             data.device,
+                             "Max Speed",
+                             lambda d: d.max_speed,
+                             ACInfinityDevice.async_set_max_speed),
+        ))
+    if data.capabilities.auto_mode:
+        entities.extend((
+            TemperatureNumber(data.coordinator,
+                              data.device,
+                              "Auto Mode High Temperature",
+                              lambda d: None if d.auto_mode is None else d.auto_mode.high_temp,
+                              ACInfinityDevice.async_set_auto_high_temp),
+            TemperatureNumber(data.coordinator,
+                              data.device,
+                              "Auto Mode Low Temperature",
+                              lambda d: None if d.auto_mode is None else d.auto_mode.low_temp,
+                              ACInfinityDevice.async_set_auto_low_temp),
+        ))
 
     async_add_entities(entities)
 
@@ -72,24 +76,19 @@ class ACInfinityNumber(
         super().__init__(coordinator)
         self._device = device
         self._attr_name = name
-        self._attr_unique_id = f"{self._device.address}_number_{slugify(name)}"
+        self._attr_unique_id = f"{self._device.address}_number_{entity_key(name)}"
         self._attr_device_info = DeviceInfo(
             name=device.name,
-            model=DEVICE_MODEL[device.state.type],
+            model=get_model_name(device.state.type),
             manufacturer=MANUFACTURER,
             sw_version=device.state.version,
             connections={(dr.CONNECTION_BLUETOOTH, device.address)},
         )
+        self._update_attrs()
 
     @callback
-    def _update_attrs(self) -> None:
-        raise NotImplementedError("Not yet implemented.")
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._update_attrs()
-        super()._handle_coordinator_update()
+    def _published_state(self) -> tuple[Any, ...]:
+        return (self.available, self._attr_native_value)
 
 
 class PercentageNumber(ACInfinityNumber):
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+
+# Window names and lengths in seconds.
+ROLLING_WINDOWS: dict[str, int] = {"5 min": 5 * 60, "1 h": 60 * 60, "24 h": 24 * 60 * 60}
+# Each window is split into this many buckets; it slides a bucket at a time.
+_BUCKETS = 60
+# One slot more than the window, for the oldest bucket, which is partly in it.
+_SLOTS = _BUCKETS + 1
+
+
+class RollingWindow:
+    """Minimum, maximum and time-weighted mean over a sliding time window.
+
+    The window is kept as a fixed ring of buckets, each aggregating the time
+    values were held for within its slice of time, so memory is constant.
+    Buckets older than the window are reused as time moves on.
+    """
+
+    __slots__ = ("_epochs", "_maxs", "_mins", "_span", "_sums", "_weights", "_width")
+
+    def __init__(self, span: float) -> None:
+        self._span = span
+        self._width = span / _BUCKETS
+        self._epochs = [-1] * _SLOTS
+        self._mins = [math.inf] * _SLOTS
+        self._maxs = [-math.inf] * _SLOTS
+        self._sums = [0.0] * _SLOTS
+        self._weights = [0.0] * _SLOTS
+
+    def _slot(self, epoch: int) -> int:
+        """Return the slot of the bucket for `epoch`, emptying it if it held an older one."""
+        slot = epoch % _SLOTS
+        if self._epochs[slot] != epoch:
+            self._epochs[slot] = epoch
+            self._mins[slot] = math.inf
+            self._maxs[slot] = -math.inf
+            self._sums[slot] = 0.0
+            self._weights[slot] = 0.0
+        return slot
+
+    def add(self, now: float, value: float, previous: float, held_seconds: float) -> None:
+        """Add `value`, replacing `previous`, which was held for `held_seconds` until now.
+
+        The holding time of the previous value is spread over the buckets it
+        covers, as far back as the window reaches.
+        """
+        width = self._width
+        epoch = int(now // width)
+        start = max(now - held_seconds, (epoch - _BUCKETS) * width)
+        for held_epoch in range(int(start // width), epoch + 1):
+            overlap = min(now, (held_epoch + 1) * width) - max(start, held_epoch * width)
+            if overlap <= 0:
+                continue
+            slot = self._slot(held_epoch)
+            if previous < self._mins[slot]:
+                self._mins[slot] = previous
+            if previous > self._maxs[slot]:
+                self._maxs[slot] = previous
+            self._sums[slot] += previous * overlap
+            self._weights[slot] += overlap
+        slot = self._slot(epoch)
+        if value < self._mins[slot]:
+            self._mins[slot] = value
+        if value > self._maxs[slot]:
+            self._maxs[slot] = value
+
+    def summary(self, now: float, held_value: float, held_seconds: float) -> tuple[float, float, float]:
+        """Return (min, max, mean) of the window.
+
+        `held_value` is the current value, held for the last `held_seconds`.
+        It counts toward the window even if it was added before the window.
+        The oldest bucket, only partly in the window, is weighted by the part
+        that is.
+        """
+        epoch = int(now // self._width)
+        oldest = epoch - _BUCKETS
+        oldest_fraction = (epoch + 1) - now / self._width
+        held_seconds = min(held_seconds, self._span)
+        minimum = maximum = held_value
+        total = held_value * held_seconds
+        weight = held_seconds
+        for slot, bucket_epoch in enumerate(self._epochs):
+            if bucket_epoch < oldest or (bucket_epoch == oldest and oldest_fraction <= 0):
+                continue
+            fraction = oldest_fraction if bucket_epoch == oldest else 1.0
+            minimum = min(minimum, self._mins[slot])
+            maximum = max(maximum, self._maxs[slot])
+            total += self._sums[slot] * fraction
+            weight += self._weights[slot] * fraction
+        return minimum, maximum, total / weight if weight else held_value
+
+
+class RollingStatistics:
+    """Rolling statistics of one reading over each of ROLLING_WINDOWS."""
+
+    __slots__ = ("_last_time", "_last_value", "_window_list", "windows")
+
+    def __init__(self) -> None:
+        self.windows = {name: RollingWindow(span) for name, span in ROLLING_WINDOWS.items()}
+        self._window_list = tuple(self.windows.values())
+        self._last_value: float | None = None
+        self._last_time = 0.0
+
+    def add(self, value: float, now: float) -> None:
+        """Add a reading; repeats of the current reading are ignored."""
+        previous = self._last_value
+        if value == previous:
+            return
+        if previous is None:
+            previous, held_seconds = value, 0.0
+        else:
+            held_seconds = now - self._last_time
+        for window in self._window_list:
+            window.add(now, value, previous, held_seconds)
+        self._last_value = value
+        self._last_time = now
+
+    def summary(self, window: str, now: float) -> tuple[float, float, float] | None:
+        """Return (min, max, mean) over the named window, or None without readings."""
+        if self._last_value is None:
+            return None
+        return self.windows[window].summary(now, self._last_value, now - self._last_time)
+
+
+@dataclass(slots=True)
+class DeviceStatistics:
+    """Rolling statistics of a device's advertised readings."""
+
+    temperature: RollingStatistics = field(default_factory=RollingStatistics)
+    humidity: RollingStatistics = field(default_factory=RollingStatistics)
+    vpd: RollingStatistics = field(default_factory=RollingStatistics)
+
+    def add(self, temperature: float, humidity: float, vpd: float | None, now: float) -> None:
+        self.temperature.add(temperature, now)
+        self.humidity.add(humidity, now)
+        if vpd is not None:
+            self.vpd.add(vpd, now)
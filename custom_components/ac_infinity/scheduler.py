@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+
+from .const import DOMAIN, MAX_CONNECTIONS_PER_SOURCE
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_CONNECTION_SCHEDULER = f"{DOMAIN}_connection_scheduler"
+
+
+class ConnectionScheduler:
+    """Limits the number of concurrent GATT connections per adapter or proxy.
+
+    Devices acquire a slot for their source before connecting and release it
+    once disconnected. Devices waiting for a slot are served in order of
+    arrival.
+
+    A device that keeps its connection open between operations parks its
+    slot while idle. When another device has to wait for a slot on the same
+    source, the longest parked device is asked to disconnect and hand its
+    slot over, so that kept connections never starve the other devices.
+    """
+
+    def __init__(self, slots_per_source: int = MAX_CONNECTIONS_PER_SOURCE) -> None:
+        self._slots_per_source = slots_per_source
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._waiters: dict[str, int] = {}
+        self._parked: dict[str, list[Callable[[], bool]]] = {}
+
+    def _semaphore(self, source: str) -> asyncio.Semaphore:
+        if (semaphore := self._semaphores.get(source)) is None:
+            semaphore = self._semaphores[source] = asyncio.Semaphore(self._slots_per_source)
+        return semaphore
+
+    async def acquire(self, source: str) -> None:
+        """Wait for a free connection slot on `source`."""
+        semaphore = self._semaphore(source)
+        if semaphore.locked():
+            _LOGGER.debug("All %s connection slots on %s in use; waiting", self._slots_per_source, source)
+            self._reclaim_parked(source)
+        self._waiters[source] = self._waiters.get(source, 0) + 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiters[source] -= 1
+
+    def release(self, source: str) -> None:
+        """Return a connection slot on `source`."""
+        self._semaphores[source].release()
+
+    def has_waiters(self, source: str) -> bool:
+        """Whether any device is waiting for a connection slot on `source`."""
+        return self._waiters.get(source, 0) > 0
+
+    def park(self, source: str, reclaim: Callable[[], bool]) -> None:
+        """Offer a slot held on `source` to waiting devices while its holder is idle.
+
+        `reclaim` is called when a device has to wait for a slot. It returns
+        True if the holder will disconnect and release the slot, or False if
+        it is busy; a busy holder hands the slot over at the end of its
+        operation instead, as it then sees the waiting device.
+        """
+        parked = self._parked.setdefault(source, [])
+        if reclaim not in parked:
+            parked.append(reclaim)
+
+    def unpark(self, source: str, reclaim: Callable[[], bool]) -> None:
+        """Withdraw a parked slot, once it has been released."""
+        parked = self._parked.get(source)
+        if parked and reclaim in parked:
+            parked.remove(reclaim)
+
+    def _reclaim_parked(self, source: str) -> None:
+        parked = self._parked.get(source)
+        while parked:
+            if parked.pop(0)():
+                return
+
+
+@singleton(DATA_CONNECTION_SCHEDULER)
+@callback
+def async_get_connection_scheduler(hass: HomeAssistant) -> ConnectionScheduler:
+    """Return the connection scheduler shared by all config entries."""
+    return ConnectionScheduler()
@@ -1,20 +1,32 @@
 from __future__ import annotations
 
-from homeassistant.components.bluetooth.passive_update_coordinator import \
-    PassiveBluetoothCoordinatorEntity
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
 from homeassistant.components.sensor import (SensorDeviceClass, SensorEntity,
                                              SensorStateClass)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, UnitOfPressure, UnitOfTemperature
+from homeassistant.const import (PERCENTAGE, EntityCategory, UnitOfPressure,
+                                 UnitOfTemperature, UnitOfTime)
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.util import slugify
 
-from .const import DEVICE_MODEL, DOMAIN, FAMILY_E_MODELS, MANUFACTURER
-from .coordinator import ACInfinityDataUpdateCoordinator
+from .capabilities import get_model_name
+from .const import (CONF_HUMIDITY_DEADBAND, CONF_HUMIDITY_MIN_INTERVAL,
+                    CONF_SENSOR_MAX_AGE, CONF_TEMPERATURE_DEADBAND,
+                    CONF_TEMPERATURE_MIN_INTERVAL, CONF_VPD_DEADBAND,
+                    CONF_VPD_MIN_INTERVAL, DEFAULT_DEADBAND,
+                    DEFAULT_MIN_INTERVAL, DEFAULT_SENSOR_MAX_AGE, DOMAIN,
+                    MANUFACTURER)
+from .coordinator import (ACInfinityDataUpdateCoordinator,
+                          ActiveBluetoothCoordinatorEntity, entity_key)
 from .device import ACInfinityDevice
+from .metrics import DeviceMetrics, LatencyWindow
+from .rolling import ROLLING_WINDOWS, DeviceStatistics, RollingStatistics
 from .models import ACInfinityData
 
 
@@ -24,49 +36,136 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     data: ACInfinityData = hass.data[DOMAIN][entry.entry_id]
-    entities = [TemperatureSensor(data.coordinator, data.device, "Temperature")]
+    options = entry.options
+    temperature_policy = PublishPolicy.from_options(
+        options, CONF_TEMPERATURE_DEADBAND, CONF_TEMPERATURE_MIN_INTERVAL
+    )
+    humidity_policy = PublishPolicy.from_options(options, CONF_HUMIDITY_DEADBAND, CONF_HUMIDITY_MIN_INTERVAL)
+    vpd_policy = PublishPolicy.from_options(options, CONF_VPD_DEADBAND, CONF_VPD_MIN_INTERVAL)
+
+    entities: list[ACInfinitySensor] = [
+        TemperatureSensor(data.coordinator, data.device, "Temperature", temperature_policy)
+    ]
+    entities.extend(
+        TemperatureMeanSensor(
+            data.coordinator, data.device, f"Temperature Mean ({window})", temperature_policy,
+            lambda s: s.temperature, window
+        )
+        for window in ROLLING_WINDOWS
+    )
+
+    if data.capabilities.humidity:
+        entities.append(HumiditySensor(data.coordinator, data.device, "Humidity", humidity_policy))
+        entities.extend(
+            HumidityMeanSensor(
+                data.coordinator, data.device, f"Humidity Mean ({window})", humidity_policy,
+                lambda s: s.humidity, window
+            )
+            for window in ROLLING_WINDOWS
+        )
 
-    if data.device.state.type not in [6]:  # Airtap does not have humidity
-        entities.append(HumiditySensor(data.coordinator, data.device, "Humidity"))
+    if data.capabilities.vpd:
+        entities.append(VpdSensor(data.coordinator, data.device, "VPD", vpd_policy))
+        entities.extend(
+            VpdMeanSensor(
+                data.coordinator, data.device, f"VPD Mean ({window})", vpd_policy,
+                lambda s: s.vpd, window
+            )
+            for window in ROLLING_WINDOWS
+        )
 
-    if data.device.state.version >= 3 and data.device.state.type in FAMILY_E_MODELS:
-        entities.append(VpdSensor(data.coordinator, data.device, "VPD"))
+    entities.extend(
+        (
+            LatencySensor(data.coordinator, data.device, "Connect Latency", lambda m: m.connect),
+            LatencySensor(data.coordinator, data.device, "Command Latency", lambda m: m.send),
+            LatencySensor(data.coordinator, data.device, "Disconnect Latency", lambda m: m.disconnect),
+            LatencySensor(data.coordinator, data.device, "Poll Latency", lambda m: m.update),
+            LatencySensor(data.coordinator, data.device, "Advertisement Latency", lambda m: m.advertisement),
+            PollCountSensor(data.coordinator, data.device, "Poll Successes", lambda m: m.poll_successes),
+            PollCountSensor(data.coordinator, data.device, "Poll Failures", lambda m: m.poll_failures),
+        )
+    )
     async_add_entities(entities)
 
 
+@dataclass(frozen=True, slots=True)
+class PublishPolicy:
+    """Limits on how often a sensor's state is written.
+
+    A new value is written once it differs from the last written one by at
+    least `deadband`, and no sooner than `min_interval` seconds after the last
+    write. After `max_age` seconds the state is written again even if
+    unchanged. Zero disables each limit.
+    """
+
+    deadband: float = 0.0
+    min_interval: float = 0.0
+    max_age: float = 0.0
+
+    @staticmethod
+    def from_options(options: Mapping[str, Any], deadband_key: str, min_interval_key: str) -> PublishPolicy:
+        return PublishPolicy(
+            deadband=options.get(deadband_key, DEFAULT_DEADBAND),
+            min_interval=options.get(min_interval_key, DEFAULT_MIN_INTERVAL),
+            max_age=options.get(CONF_SENSOR_MAX_AGE, DEFAULT_SENSOR_MAX_AGE),
+        )
+
+
+_PUBLISH_ALL = PublishPolicy()
+
+
 class ACInfinitySensor(
-    PassiveBluetoothCoordinatorEntity[ACInfinityDataUpdateCoordinator], SensorEntity
+    ActiveBluetoothCoordinatorEntity[ACInfinityDataUpdateCoordinator], SensorEntity
 ):
     _attr_has_entity_name = True
+    _last_published_at = 0.0
 
     def __init__(
         self,
         coordinator: ACInfinityDataUpdateCoordinator,
         device: ACInfinityDevice,
         name: str,
+        publish_policy: PublishPolicy = _PUBLISH_ALL,
     ) -> None:
         super().__init__(coordinator)
         self._device = device
+        self._publish_policy = publish_policy
         self._name = name
-        self._attr_unique_id = f"{self._device.address}_{slugify(name)}"
+        self._attr_unique_id = f"{self._device.address}_{entity_key(name)}"
         self._attr_device_info = DeviceInfo(
             name=device.name,
-            model=DEVICE_MODEL[device.state.type],
+            model=get_model_name(device.state.type),
             manufacturer=MANUFACTURER,
             sw_version=device.state.version,
             connections={(dr.CONNECTION_BLUETOOTH, device.address)},
         )
+        self._update_attrs()
 
     @callback
-    def _update_attrs(self) -> None:
-        """Handle updating _attr values."""
-        raise NotImplementedError("Not yet implemented.")
+    def _published_state(self) -> tuple[Any, ...]:
+        return (self.available, self._attr_native_value, self.extra_state_attributes)
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._update_attrs()
-        super()._handle_coordinator_update()
+    def _should_publish(self, published: tuple[Any, ...]) -> bool:
+        """Whether the publish policy allows writing `published`; changes in availability always are.
+
+        An allowed write is about to happen, so its time is recorded.
+        """
+        last = self._last_published
+        now = time.monotonic()
+        policy = self._publish_policy
+        if (
+            last is not None
+            and published[0] == last[0]
+            and not (policy.max_age and now - self._last_published_at >= policy.max_age)
+        ):
+            if published == last or now - self._last_published_at < policy.min_interval:
+                return False
+            value, last_value = published[1], last[1]
+            if value is not None and last_value is not None and abs(value - last_value) < policy.deadband:
+                return False
+        self._last_published_at = now
+        return True
 
 
 class TemperatureSensor(ACInfinitySensor):
@@ -100,3 +199,102 @@ class VpdSensor(ACInfinitySensor):
     def _update_attrs(self) -> None:
         """Handle updating _attr values."""
         self._attr_native_value = self._device.vpd
+
+
+class RollingMeanSensor(ACInfinitySensor):
+    """Time-weighted mean of a reading over a rolling window, with the minimum and maximum as attributes."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: ACInfinityDataUpdateCoordinator,
+        device: ACInfinityDevice,
+        name: str,
+        publish_policy: PublishPolicy,
+        statistics: Callable[[DeviceStatistics], RollingStatistics],
+        window: str,
+    ) -> None:
+        self._statistics = statistics(device.statistics)
+        self._window = window
+        super().__init__(coordinator, device, name, publish_policy)
+
+    @callback
+    def _update_attrs(self) -> None:
+        """Handle updating _attr values."""
+        if (summary := self._statistics.summary(self._window, time.monotonic())) is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+        minimum, maximum, mean = summary
+        self._attr_native_value = round(mean, 2)
+        self._attr_extra_state_attributes = {"min": minimum, "max": maximum}
+
+
+class TemperatureMeanSensor(RollingMeanSensor):
+    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+
+
+class HumidityMeanSensor(RollingMeanSensor):
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_device_class = SensorDeviceClass.HUMIDITY
+
+
+class VpdMeanSensor(RollingMeanSensor):
+    _attr_native_unit_of_measurement = UnitOfPressure.KPA
+    _attr_device_class = SensorDeviceClass.ATMOSPHERIC_PRESSURE
+
+
+class LatencySensor(ACInfinitySensor):
+    """Median of the recent latencies of one operation, with the 95th percentile and maximum as attributes."""
+
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 0
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: ACInfinityDataUpdateCoordinator,
+        device: ACInfinityDevice,
+        name: str,
+        window: Callable[[DeviceMetrics], LatencyWindow],
+    ) -> None:
+        self._window = window(device.metrics)
+        super().__init__(coordinator, device, name)
+
+    @callback
+    def _update_attrs(self) -> None:
+        """Handle updating _attr values."""
+        if (summary := self._window.summary()) is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+        p50, p95, maximum = (round(seconds * 1000) for seconds in summary)
+        self._attr_native_value = p50
+        self._attr_extra_state_attributes = {"p95": p95, "max": maximum, "samples": self._window.count}
+
+
+class PollCountSensor(ACInfinitySensor):
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: ACInfinityDataUpdateCoordinator,
+        device: ACInfinityDevice,
+        name: str,
+        count: Callable[[DeviceMetrics], int],
+    ) -> None:
+        self._count = count
+        super().__init__(coordinator, device, name)
+
+    @callback
+    def _update_attrs(self) -> None:
+        """Handle updating _attr values."""
+        self._attr_native_value = self._count(self._device.metrics)
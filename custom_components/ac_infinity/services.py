@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import functools
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.core import (HomeAssistant, ServiceCall, ServiceResponse,
+                                SupportsResponse, callback)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.service import async_extract_config_entry_ids
+
+from .const import DOMAIN
+from .device import ACInfinityDevice, AutoModeConfig
+from .models import ACInfinityData
+from .snapshot import async_get_snapshot_store
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_APPLY_PROFILE = "apply_profile"
+SERVICE_SAVE_CONFIG = "save_config"
+SERVICE_RESTORE_CONFIG = "restore_config"
+
+ATTR_MIN_SPEED = "min_speed"
+ATTR_MAX_SPEED = "max_speed"
+ATTR_MAX_CONCURRENCY = "max_concurrency"
+
+DEFAULT_MAX_CONCURRENCY = 5
+
+_TEMPERATURE = vol.All(vol.Coerce(int), vol.Range(min=0, max=90))
+_HUMIDITY = vol.All(vol.Coerce(int), vol.Range(min=0, max=100))
+_SPEED = vol.All(vol.Coerce(int), vol.Range(min=0, max=10))
+_MAX_CONCURRENCY = vol.All(vol.Coerce(int), vol.Range(min=1, max=20))
+
+APPLY_PROFILE_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Required("high_temp_enabled"): cv.boolean,
+        vol.Required("high_temp"): _TEMPERATURE,
+        vol.Required("low_temp_enabled"): cv.boolean,
+        vol.Required("low_temp"): _TEMPERATURE,
+        vol.Required("high_humidity_enabled"): cv.boolean,
+        vol.Required("high_humidity"): _HUMIDITY,
+        vol.Required("low_humidity_enabled"): cv.boolean,
+        vol.Required("low_humidity"): _HUMIDITY,
+        vol.Optional(ATTR_MIN_SPEED): _SPEED,
+        vol.Optional(ATTR_MAX_SPEED): _SPEED,
+        vol.Optional(ATTR_MAX_CONCURRENCY, default=DEFAULT_MAX_CONCURRENCY): _MAX_CONCURRENCY,
+    }
+)
+SAVE_CONFIG_SCHEMA = cv.make_entity_service_schema({})
+RESTORE_CONFIG_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Optional(ATTR_MAX_CONCURRENCY, default=DEFAULT_MAX_CONCURRENCY): _MAX_CONCURRENCY,
+    }
+)
+
+
+async def _async_get_targets(hass: HomeAssistant, call: ServiceCall) -> list[ACInfinityData]:
+    entries: dict[str, ACInfinityData] = hass.data.get(DOMAIN, {})
+    targets = [
+        entries[entry_id]
+        for entry_id in await async_extract_config_entry_ids(hass, call)
+        if entry_id in entries
+    ]
+    if not targets:
+        raise ServiceValidationError("No loaded AC Infinity devices were targeted")
+    return targets
+
+
+async def _async_run_on_targets(
+    targets: list[ACInfinityData],
+    max_concurrency: int,
+    action: str,
+    run: Callable[[ACInfinityDevice], Awaitable[dict[str, Any] | None]],
+) -> ServiceResponse:
+    """Run `run` on each target's device, at most `max_concurrency` at a time.
+
+    Returns the outcome and latency per device address, along with whatever
+    `run` returned.
+    """
+    limit = asyncio.Semaphore(max_concurrency)
+
+    async def _async_run(data: ACInfinityData) -> dict[str, Any]:
+        async with limit:
+            start = time.monotonic()
+            result: dict[str, Any] = {"name": data.title}
+            try:
+                result.update(await run(data.device) or {})
+            except Exception as ex:  # pylint: disable=broad-except
+                _LOGGER.warning("%s: Failed to %s: %s", data.device.name, action, ex)
+                error: str | None = str(ex) or type(ex).__name__
+            else:
+                error = None
+            result["success"] = error is None
+            result["error"] = error
+            result["latency_ms"] = round((time.monotonic() - start) * 1000)
+            return result
+
+    results = await asyncio.gather(*(_async_run(data) for data in targets))
+    return {
+        "devices": {data.device.address: result for data, result in zip(targets, results)}
+    }
+
+
+async def _async_apply_profile_to_device(
+    device: ACInfinityDevice,
+    config: AutoModeConfig,
+    min_speed: int | None,
+    max_speed: int | None,
+) -> None:
+    """Send the whole profile; the commands are coalesced into one connection session."""
+    writes = [device.async_set_auto_mode_config(config)]
+    if min_speed is not None:
+        writes.append(device.async_set_min_speed(min_speed))
+    if max_speed is not None:
+        writes.append(device.async_set_max_speed(max_speed))
+    await asyncio.gather(*writes)
+
+
+async def _async_apply_profile(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Push an auto mode profile, and optionally speed limits, to the targeted devices."""
+    targets = await _async_get_targets(hass, call)
+    config = AutoModeConfig(
+        **{field.name: call.data[field.name] for field in dataclasses.fields(AutoModeConfig)}
+    )
+    min_speed = call.data.get(ATTR_MIN_SPEED)
+    max_speed = call.data.get(ATTR_MAX_SPEED)
+
+    async def _async_apply(device: ACInfinityDevice) -> None:
+        await _async_apply_profile_to_device(device, config, min_speed, max_speed)
+
+    return await _async_run_on_targets(targets, call.data[ATTR_MAX_CONCURRENCY], "apply profile", _async_apply)
+
+
+async def _async_save_config(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Save the current configuration of the targeted devices, to be restored later."""
+    targets = await _async_get_targets(hass, call)
+    snapshots = await async_get_snapshot_store(hass)
+    saved = {}
+    for data in targets:
+        config = data.device.config
+        snapshots.async_save_config(data.device.address, config)
+        saved[data.device.address] = {"name": data.title, **dataclasses.asdict(config)}
+    return {"devices": saved}
+
+
+async def _async_restore_config(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Restore the saved configuration of the targeted devices, writing only what differs."""
+    targets = await _async_get_targets(hass, call)
+    snapshots = await async_get_snapshot_store(hass)
+
+    async def _async_restore(device: ACInfinityDevice) -> dict[str, Any]:
+        if (config := snapshots.saved_config(device.address)) is None:
+            raise ServiceValidationError(f"No saved configuration for {device.name}")
+        changed, skipped = await device.async_restore_config(config)
+        return {"changed": changed, "skipped": skipped}
+
+    return await _async_run_on_targets(targets, call.data[ATTR_MAX_CONCURRENCY], "restore config", _async_restore)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+
+    for service, handler, schema in (
+        (SERVICE_APPLY_PROFILE, _async_apply_profile, APPLY_PROFILE_SCHEMA),
+        (SERVICE_SAVE_CONFIG, _async_save_config, SAVE_CONFIG_SCHEMA),
+        (SERVICE_RESTORE_CONFIG, _async_restore_config, RESTORE_CONFIG_SCHEMA),
+    ):
+        hass.services.async_register(
+            DOMAIN,
+            service,
+            functools.partial(handler, hass),
+            schema=schema,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import dataclasses
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .device import (ACInfinityDevice, AutoModeConfig, DeviceConfig,
+                     DeviceInfoEx)
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_SNAPSHOT_STORE = f"{DOMAIN}_snapshot_store"
+STORAGE_KEY = f"{DOMAIN}.snapshots"
+STORAGE_VERSION = 1
+
+# Snapshots are written at most this often, and not restored when older than SNAPSHOT_MAX_AGE.
+SNAPSHOT_SAVE_DELAY = 60
+SNAPSHOT_MAX_AGE = 24 * 60 * 60
+
+# Snapshots are stored as [saved_at, [state fields...], [auto mode fields...] | None],
+# and saved configurations as [work_type, level_off, level_on, [auto mode fields...] | None].
+# Changing these field lists requires a new STORAGE_VERSION.
+_STATE_FIELDS = (
+    "type",
+    "name",
+    "version",
+    "is_degree",
+    "work_type",
+    "level_on",
+    "level_off",
+    "fan",
+    "tmp",
+    "hum",
+    "vpd",
+)
+_AUTO_MODE_FIELDS = tuple(field.name for field in dataclasses.fields(AutoModeConfig))
+
+
+def _encode_auto_mode(auto_mode: AutoModeConfig | None) -> list[Any] | None:
+    return None if auto_mode is None else [getattr(auto_mode, field) for field in _AUTO_MODE_FIELDS]
+
+
+def _decode_auto_mode(auto_mode: list[Any] | None) -> AutoModeConfig | None:
+    return None if auto_mode is None else AutoModeConfig(**dict(zip(_AUTO_MODE_FIELDS, auto_mode, strict=True)))
+
+
+def _encode_snapshot(state: DeviceInfoEx) -> list[Any]:
+    return [
+        time.time(),
+        [getattr(state, field) for field in _STATE_FIELDS],
+        _encode_auto_mode(state.auto_mode),
+    ]
+
+
+def _decode_snapshot(snapshot: list[Any]) -> tuple[float, DeviceInfoEx]:
+    saved_at, values, auto_mode = snapshot
+    state = DeviceInfoEx(**dict(zip(_STATE_FIELDS, values, strict=True)))
+    state.auto_mode = _decode_auto_mode(auto_mode)
+    return saved_at, state
+
+
+class DeviceSnapshotStore:
+    """Persists the last known state of each device so it can be restored at startup.
+
+    Also holds configurations saved by the user, to be restored on request.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[dict[str, dict[str, list[Any]]]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._snapshots: dict[str, list[Any]] = {}
+        self._configs: dict[str, list[Any]] = {}
+        self._devices: dict[str, ACInfinityDevice] = {}
+        self._save_scheduled = False
+
+    async def async_load(self) -> None:
+        if data := await self._store.async_load():
+            self._snapshots = data["devices"]
+            self._configs = data.get("configs", {})
+
+    def restore(self, address: str) -> DeviceInfoEx | None:
+        """Return the last known state of a device, unless missing or too old."""
+        if (snapshot := self._snapshots.get(address)) is None:
+            return None
+        try:
+            saved_at, state = _decode_snapshot(snapshot)
+        except (TypeError, ValueError):
+            _LOGGER.warning("Ignoring invalid state snapshot for %s: %s", address, snapshot)
+            return None
+        if time.time() - saved_at > SNAPSHOT_MAX_AGE:
+            return None
+        return state
+
+    @callback
+    def async_track(self, device: ACInfinityDevice) -> CALLBACK_TYPE:
+        """Save snapshots of the device's state as it changes; returns a callback to stop."""
+        address = device.address
+        self._devices[address] = device
+        unregister = device.register_callback(lambda _state, _type: self._async_schedule_save())
+
+        @callback
+        def _async_untrack() -> None:
+            unregister()
+            del self._devices[address]
+            self._snapshots[address] = _encode_snapshot(device.state)
+            self._async_schedule_save()
+
+        return _async_untrack
+
+    @callback
+    def async_save_config(self, address: str, config: DeviceConfig) -> None:
+        """Save a device's configuration, replacing any saved before."""
+        self._configs[address] = [
+            config.work_type, config.level_off, config.level_on, _encode_auto_mode(config.auto_mode)
+        ]
+        self._async_schedule_save()
+
+    def saved_config(self, address: str) -> DeviceConfig | None:
+        """Return the configuration saved for a device, if any."""
+        if (saved := self._configs.get(address)) is None:
+            return None
+        work_type, level_off, level_on, auto_mode = saved
+        return DeviceConfig(work_type, level_off, level_on, _decode_auto_mode(auto_mode))
+
+    @callback
+    def async_remove(self, address: str) -> None:
+        """Forget the snapshot and saved configuration of a removed device."""
+        removed_snapshot = self._snapshots.pop(address, None)
+        removed_config = self._configs.pop(address, None)
+        if removed_snapshot is not None or removed_config is not None:
+            self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        if self._save_scheduled:
+            return
+        self._save_scheduled = True
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict[str, list[Any]]]:
+        self._save_scheduled = False
+        for address, device in self._devices.items():
+            self._snapshots[address] = _encode_snapshot(device.state)
+        return {"devices": self._snapshots, "configs": self._configs}
+
+
+@singleton(DATA_SNAPSHOT_STORE)
+async def async_get_snapshot_store(hass: HomeAssistant) -> DeviceSnapshotStore:
+    """Return the loaded snapshot store shared by all config entries."""
+    store = DeviceSnapshotStore(hass)
+    await store.async_load()
+    return store
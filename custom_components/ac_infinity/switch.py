@@ -10,11 +10,11 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.util import slugify
 
-from .const import DEVICE_MODEL, DOMAIN, MANUFACTURER
+from .capabilities import get_model_name
+from .const import DOMAIN, MANUFACTURER
 from .coordinator import (ACInfinityDataUpdateCoordinator,
-                          ActiveBluetoothCoordinatorEntity)
+                          ActiveBluetoothCoordinatorEntity, entity_key)
 from .device import ACInfinityDevice
 from .models import ACInfinityData
 
@@ -61,16 +61,17 @@ class ACInfinitySwitch(
         super().__init__(coordinator)
         self._device = device
         self._attr_name = name
-        self._attr_unique_id = f"{self._device.address}_switch_{slugify(name)}"
+        self._attr_unique_id = f"{self._device.address}_switch_{entity_key(name)}"
         self._attr_device_info = DeviceInfo(
             name=device.name,
-            model=DEVICE_MODEL[device.state.type],
+            model=get_model_name(device.state.type),
             manufacturer=MANUFACTURER,
             sw_version=device.state.version,
             connections={(dr.CONNECTION_BLUETOOTH, device.address)},
         )
         self._get_is_on = get_is_on
         self._async_set_is_on = async_set_is_on
+        self._update_attrs()
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on switch."""
@@ -85,7 +86,5 @@ class ACInfinitySwitch(
         self._attr_is_on = self._get_is_on(self._device)
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._update_attrs()
-        super()._handle_coordinator_update()
+    def _published_state(self) -> tuple[Any, ...]:
+        return (self.available, self._attr_is_on)
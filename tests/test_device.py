@@ -0,0 +1,143 @@
+"""Behaviour of ACInfinityDevice against the controller simulator in benchmarks/simulator.py."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from bleak.exc import BleakError
+
+from benchmarks.simulator import (ControllerSimulator, SimulatorProfile,
+                                  _frame)
+from custom_components.ac_infinity.device import (WORK_TYPE_AUTO,
+                                                  WORK_TYPE_OFF, WORK_TYPE_ON,
+                                                  ACInfinityDevice,
+                                                  DeviceConfig)
+
+ADDRESS = "AA:BB:CC:DD:EE:01"
+
+
+def make_device(simulator: ControllerSimulator) -> ACInfinityDevice:
+    controller = simulator.add_controller(ADDRESS)
+    return ACInfinityDevice(controller.ble_device, advertisement_data=controller.advertisement())
+
+
+def test_failed_connect_drops_pending_auto_mode() -> None:
+    async def run() -> None:
+        simulator = ControllerSimulator(SimulatorProfile(connect_latency=0.01, response_latency=0.01))
+        device = make_device(simulator)
+        controller = simulator.controllers[ADDRESS]
+        with simulator.patch():
+            await device.update()
+            simulator.profile.connection_slots = 0
+            with pytest.raises(BleakError):
+                await device.async_set_auto_high_temp(35)
+            assert device.auto_mode.high_temp == 30
+
+            # The failed high temperature must not be merged into the next edit.
+            simulator.profile.connection_slots = None
+            await device.async_set_auto_low_temp(10)
+            await device.stop()
+        assert (controller.high_temp, controller.low_temp) == (30, 10)
+
+    asyncio.run(run())
+
+
+def test_failed_connect_keeps_unchanged_edit_skipped() -> None:
+    async def run() -> None:
+        simulator = ControllerSimulator(SimulatorProfile(connect_latency=0.01, response_latency=0.01))
+        device = make_device(simulator)
+        with simulator.patch():
+            await device.update()
+            simulator.profile.connection_slots = 0
+            with pytest.raises(BleakError):
+                await device.async_set_auto_high_temp(35)
+
+            # Setting the current value again is a no-op once nothing is pending.
+            simulator.profile.connection_slots = None
+            commands = simulator.stats.commands
+            await device.async_set_auto_high_temp(30)
+            await device.stop()
+        assert simulator.stats.commands == commands
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("contradicted", [False, True])
+def test_deferred_first_poll(contradicted: bool) -> None:
+    async def run() -> None:
+        simulator = ControllerSimulator()
+        # An address with a poll phase of 0.97, deferring its first poll the longest.
+        controller = simulator.add_controller("AA:BB:CC:DD:EE:03", level_on=7)
+        device = ACInfinityDevice(
+            controller.ble_device, advertisement_data=controller.advertisement(), max_poll_interval=86400
+        )
+        # As restored from a snapshot: on mode at level 7, or a stale level 3.
+        device.state.work_type = WORK_TYPE_ON
+        device.state.level_on = 3 if contradicted else 7
+        with patch("custom_components.ac_infinity.device.time") as clock:
+            clock.monotonic.return_value = 1000.0
+            device.defer_first_poll()
+            clock.monotonic.return_value = 1100.0
+            assert not device.update_needed(None)
+            device.set_ble_device_and_advertisement_data(controller.ble_device, controller.advertisement())
+            clock.monotonic.return_value = 1130.0
+            assert device.update_needed(None) == contradicted
+            # The deferral is capped well below the maximum poll interval.
+            clock.monotonic.return_value = 1300.0
+            assert device.update_needed(None)
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    ("saved", "changed", "skipped", "work_type"),
+    [
+        (DeviceConfig(WORK_TYPE_OFF, 3, None, None), ["work_type", "level_off"], [], WORK_TYPE_OFF),
+        (DeviceConfig(WORK_TYPE_AUTO, None, 8, None), ["work_type", "level_on"], [], WORK_TYPE_AUTO),
+        # Off mode cannot be set without its level.
+        (DeviceConfig(WORK_TYPE_OFF, None, 8, None), ["level_on"], ["work_type"], WORK_TYPE_ON),
+        # Nor any mode other than off, on and auto.
+        (DeviceConfig(5, 3, None, None), ["level_off"], ["work_type"], WORK_TYPE_ON),
+    ],
+)
+def test_restore_config(saved: DeviceConfig, changed: list[str], skipped: list[str], work_type: int) -> None:
+    async def run() -> tuple[list[str], list[str]]:
+        simulator = ControllerSimulator(SimulatorProfile(connect_latency=0.01, response_latency=0.01))
+        device = make_device(simulator)
+        with simulator.patch():
+            await device.update()
+            result = await device.async_restore_config(saved)
+            await device.stop()
+        assert simulator.controllers[ADDRESS].work_type == work_type
+        return result
+
+    assert asyncio.run(run()) == (changed, skipped)
+
+
+def test_partial_reply_does_not_confirm_change() -> None:
+    async def run() -> None:
+        simulator = ControllerSimulator(SimulatorProfile(connect_latency=0.01, response_latency=0.01))
+        device = make_device(simulator)
+        controller = simulator.controllers[ADDRESS]
+        full_reply = controller._model_data_reply
+        with simulator.patch():
+            # A settings command that was not acknowledged awaits confirmation by a poll.
+            device._config_changed_since_last_update = True
+            with patch.object(
+                controller,
+                "_model_data_reply",
+                lambda sequence: _frame(sequence, 1, list(full_reply(sequence)[10:19])),
+            ):
+                await device.update()
+            assert device.state.level_on == controller.level_on
+            assert device._config_changed_since_last_update
+            # Retried at the usual interval rather than on every advertisement.
+            assert not device.update_needed(1)
+            assert device.update_needed(60)
+
+            await device.update()
+            assert not device._config_changed_since_last_update
+            await device.stop()
+
+    asyncio.run(run())
@@ -0,0 +1,106 @@
+"""Setting up config entries for each kind of model, with Bluetooth patched out."""
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import sys
+import tempfile
+from pathlib import Path
+from types import MappingProxyType
+from unittest.mock import patch
+
+import pytest
+from ac_infinity_ble.protocol import parse_manufacturer_data
+from bleak.backends.device import BLEDevice
+from homeassistant import loader
+from homeassistant.config_entries import (ConfigEntries, ConfigEntry,
+                                          ConfigEntryState)
+from homeassistant.const import CONF_ADDRESS, CONF_SERVICE_DATA
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (area_registry, device_registry,
+                                   entity_registry, floor_registry,
+                                   label_registry)
+from homeassistant.setup import async_setup_component
+
+from benchmarks.bench_startup import manufacturer_data
+
+REPOSITORY = Path(__file__).resolve().parent.parent
+ADDRESS = "AA:BB:CC:DD:EE:01"
+
+
+async def set_up(device_type: int) -> tuple[ConfigEntryState, str | None, set[str]]:
+    """Set up one config entry for `device_type`.
+
+    Returns the entry's state, the model of its device and the domains of its
+    entities.
+    """
+    config_dir = Path(tempfile.mkdtemp())
+    (config_dir / "custom_components").mkdir()
+    (config_dir / "custom_components" / "ac_infinity").symlink_to(REPOSITORY / "custom_components" / "ac_infinity")
+    sys.path.insert(0, str(config_dir))
+
+    hass = HomeAssistant(str(config_dir))
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    for registry in (floor_registry, label_registry, area_registry, device_registry, entity_registry):
+        await registry.async_load(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    hass.config.components.update({"bluetooth", "bluetooth_adapters"})
+
+    service_data = dataclasses.asdict(parse_manufacturer_data(manufacturer_data(1, device_type)))
+    config_entry = ConfigEntry(
+        data={CONF_ADDRESS: ADDRESS, CONF_SERVICE_DATA: service_data},
+        discovery_keys=MappingProxyType({}),
+        domain="ac_infinity",
+        minor_version=1,
+        options={},
+        source="bluetooth",
+        subentries_data=None,
+        title="Controller",
+        unique_id=ADDRESS,
+        version=1,
+    )
+    hass.config_entries._entries[config_entry.entry_id] = config_entry
+
+    def ble_device(hass: HomeAssistant, address: str, connectable: bool = True) -> BLEDevice:
+        return BLEDevice(address, None, {}, -60)
+
+    with (
+        patch("homeassistant.components.bluetooth.async_ble_device_from_address", ble_device),
+        patch("homeassistant.components.bluetooth.update_coordinator.async_address_present", return_value=True),
+        patch("homeassistant.components.bluetooth.update_coordinator.async_register_callback"),
+        patch("homeassistant.components.bluetooth.update_coordinator.async_track_unavailable"),
+    ):
+        try:
+            assert await async_setup_component(hass, "ac_infinity", {})
+            await hass.async_block_till_done()
+            device = device_registry.async_get(hass).async_get_device(
+                connections={(device_registry.CONNECTION_BLUETOOTH, ADDRESS)}
+            )
+            domains = {
+                entry.domain
+                for entry in entity_registry.async_entries_for_config_entry(
+                    entity_registry.async_get(hass), config_entry.entry_id
+                )
+            }
+            state = config_entry.state
+            await hass.config_entries.async_unload(config_entry.entry_id)
+        finally:
+            await hass.async_stop(force=True)
+            sys.path.remove(str(config_dir))
+    return state, device.model if device else None, domains
+
+
+@pytest.mark.parametrize(
+    ("device_type", "model", "domains"),
+    [
+        (11, "Controller 69 Pro", {"fan", "number", "sensor", "switch"}),
+        # Family E, without a known model name.
+        (9, "Model 9", {"fan", "number", "sensor", "switch"}),
+        # Unknown models get the fan and sensors only.
+        (99, "Model 99", {"fan", "sensor"}),
+    ],
+)
+def test_setup(device_type: int, model: str, domains: set[str]) -> None:
+    assert asyncio.run(set_up(device_type)) == (ConfigEntryState.LOADED, model, domains)